@@ -1,36 +1,43 @@
-import re
 import os
 
+from cyrillic_letters import CYRILLIC_LETTERS, count_letters, utf8_letter_pattern
+
 # Configuration
 input_path = r"\\system-files\G\Bashqort\turkic_classification_results_bashkir.txt"
 output_path = r"\\system-files\G\Bashqort\bashkir_clean_cyrillic.txt"
 
-def is_meaningful_bashkir(text):
+# Cyrillic + Bashkir-specific chars
+BASHKIR_LETTERS = CYRILLIC_LETTERS + 'ҡғҫҙңөүһҺҠҒҪҢӨҮ'
+
+# Lines are matched as raw UTF-8 bytes, so they never need decoding
+BASHKIR_PATTERN = utf8_letter_pattern(BASHKIR_LETTERS)
+
+def is_meaningful_bashkir(line):
     """Return True if the line contains meaningful Bashkir Cyrillic text."""
-    if not text.strip():
+    if isinstance(line, str):
+        line = line.encode('utf-8')
+    if not line.strip():
         return False
-    # Count Cyrillic + Bashkir-specific chars
-    cyrillic_pattern = re.compile(r'[а-яА-ЯҡғҫҙңөүһҺҠҒҪҢӨҮ]+')
-    cyrillic_match = cyrillic_pattern.findall(text)
+    total_cyrillic = count_letters(BASHKIR_PATTERN, line)
     # Require at least 3 Cyrillic letters total
-    total_cyrillic_chars = sum(len(word) for word in cyrillic_match)
-    return total_cyrillic_chars >= 3
+    return total_cyrillic >= 3
 
 def clean_bashkir_file(input_file, output_file):
-    with open(input_file, 'r', encoding='utf-8') as f:
+    with open(input_file, 'rb') as f:
         lines = f.readlines()
 
     cleaned = []
     for line in lines:
         # Skip header lines with "Sample" and "="
-        if "Sample" in line and "=" in line:
+        if b"Sample" in line and b"=" in line:
             continue
         # Keep only meaningful Bashkir Cyrillic lines
         if is_meaningful_bashkir(line):
             cleaned.append(line.strip())
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("\n".join(cleaned))
+    # Platform line endings, as the text-mode writer produced
+    with open(output_file, 'wb') as f:
+        f.write(os.linesep.encode().join(cleaned))
 
 if __name__ == "__main__":
     clean_bashkir_file(input_path, output_path)
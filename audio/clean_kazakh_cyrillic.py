@@ -1,31 +1,39 @@
-import re
 import os
 
+from cyrillic_letters import CYRILLIC_LETTERS, count_letters, utf8_letter_pattern
+
 input_path = "C:/Users/morri/OneDrive/Documents/GitHub/Turkic-Languages-Audio-to-Text-Transcription/audio/speaker1_003_labeled_corrected.txt"
 output_path = "C:/Users/morri/OneDrive/Documents/GitHub/Turkic-Languages-Audio-to-Text-Transcription/audio/speaker1_003_cleaned.txt"
 
-def is_meaningful_kazakh(text):
-    if not text.strip():
+# Kazakh Cyrillic: includes ә, ғ, қ, ң, ө, ұ, ү, һ, і
+KAZAKH_LETTERS = CYRILLIC_LETTERS + 'әғқңөұүһіӘҒҚҢӨҰҮҺІ'
+
+# Lines are matched as raw UTF-8 bytes, so they never need decoding
+KAZAKH_PATTERN = utf8_letter_pattern(KAZAKH_LETTERS)
+
+def is_meaningful_kazakh(line):
+    if isinstance(line, str):
+        line = line.encode('utf-8')
+    if not line.strip():
         return False
-    # Kazakh Cyrillic: includes ә, ғ, қ, ң, ө, ұ, ү, һ, і
-    kazakh_pattern = re.compile(r'[а-яА-ЯәғқңөұүһіӘҒҚҢӨҰҮҺІ]+')
-    matches = kazakh_pattern.findall(text)
-    total_cyrillic = sum(len(word) for word in matches)
+    total_cyrillic = count_letters(KAZAKH_PATTERN, line)
+    # Require at least 3 Cyrillic letters total
     return total_cyrillic >= 3
 
 def clean_kazakh_file(input_file, output_file):
-    with open(input_file, 'r', encoding='utf-8') as f:
+    with open(input_file, 'rb') as f:
         lines = f.readlines()
 
     cleaned = []
     for line in lines:
-        if "Sample" in line and "=" in line:
+        if b"Sample" in line and b"=" in line:
             continue
         if is_meaningful_kazakh(line):
             cleaned.append(line.strip())
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("\n".join(cleaned))
+    # Platform line endings, as the text-mode writer produced
+    with open(output_file, 'wb') as f:
+        f.write(os.linesep.encode().join(cleaned))
 
 if __name__ == "__main__":
     clean_kazakh_file(input_path, output_path)
@@ -0,0 +1,29 @@
+"""
+Shared letter counting for the Cyrillic cleaners
+
+Lines are matched as raw UTF-8 bytes, so they never need decoding.
+"""
+
+import re
+
+# Basic Cyrillic А-Я and а-я (U+0410-U+044F)
+CYRILLIC_LETTERS = ''.join(chr(c) for c in range(ord('А'), ord('я') + 1))
+
+
+def utf8_letter_pattern(letters):
+    """Compile a bytes regex matching runs of the given 2-byte UTF-8 letters"""
+    by_lead = {}
+    for ch in letters:
+        lead, trail = ch.encode('utf-8')
+        by_lead.setdefault(lead, set()).add(trail)
+    branches = [
+        bytes([lead]) + b'[' + bytes(sorted(trails)) + b']'
+        for lead, trails in sorted(by_lead.items())
+    ]
+    return re.compile(b'(?:' + b'|'.join(branches) + b')+')
+
+
+def count_letters(pattern, line):
+    """Count the letters matched by a utf8_letter_pattern in a UTF-8 line"""
+    # Every letter is 2 bytes in UTF-8
+    return sum(len(run) for run in pattern.findall(line)) // 2
@@ -22,9 +22,10 @@ import sys
 import argparse
 import os
 from pathlib import Path
-from typing import Dict, List, Tuple, Set, Optional
+from typing import Dict, List, Tuple, Set, Optional, Iterable, Iterator
 import unicodedata
 import json
+from collections import Counter
 
 
 class KazakhToBashkirCorrector:
@@ -32,6 +33,10 @@ class KazakhToBashkirCorrector:
     Corrects Kazakh orthographic patterns to proper Bashkir orthography
     """
     
+    # Joins texts in batch_correct: a non-word, non-space symbol that no
+    # correction rule matches (U+241E SYMBOL FOR RECORD SEPARATOR)
+    BATCH_SEPARATOR = '\u241e'
+    
     def __init__(self):
         # Load word lists from external files if available
         self.preserve_қ_words = self._load_word_list('preserve_q_words.txt')
@@ -113,6 +118,11 @@ class KazakhToBashkirCorrector:
             'һ': 'һ', 'Һ': 'Һ',    # Bashkir h
         }
         
+        # Whole char_map applied in one C-level pass (identity entries dropped)
+        self._char_table = str.maketrans(
+            {k: v for k, v in self.char_map.items() if k != v}
+        )
+        
         # Grammar-specific patterns (endings)
         self.grammar_patterns = [
             # Possessive endings
@@ -161,6 +171,94 @@ class KazakhToBashkirCorrector:
             'рус': 'Урыҫ', 'өзбек': 'Үзбәк',
             'төрек': 'Төрөк', 'монғол': 'Мунғал',
         }
+        
+        # Back vowels (а, о, у, ы) + front ending → back ending
+        back_vowel_patterns = [
+            (r'([аоуы])гә\b', r'\1га'),
+            (r'([аоуы])кә\b', r'\1ка'),
+            (r'([аоуы])ҙә\b', r'\1ҙа'),
+            (r'([аоуы])тә\b', r'\1та'),
+            (r'([аоуы])нән\b', r'\1нан'),
+            (r'([аоуы])ҙән\b', r'\1ҙан'),
+            (r'([аоуы])тән\b', r'\1тан'),
+        ]
+        
+        # Front vowels (ә, ө, ү, и, е) + back ending → front ending
+        front_vowel_patterns = [
+            (r'([әөүие])га\b', r'\1гә'),
+            (r'([әөүие])ка\b', r'\1кә'),
+            (r'([әөүие])ҙа\b', r'\1ҙә'),
+            (r'([әөүие])та\b', r'\1тә'),
+            (r'([әөүие])нан\b', r'\1нән'),
+            (r'([әөүие])ҙан\b', r'\1ҙән'),
+            (r'([әөүие])тан\b', r'\1тән'),
+        ]
+        
+        self._vowel_harmony_rules = [
+            (re.compile(pattern), replacement)
+            for pattern, replacement in back_vowel_patterns + front_vowel_patterns
+        ]
+        
+        # Context-sensitive қ rules, applied in order after the char map
+        consonant = '[' + re.escape('бвгджзйлмнпрстфхцчшщң') + ']'
+        self._q_rules = [
+            # қ at beginning or after consonant → ҡ
+            (re.compile(r'(\b|' + consonant + r')қ'), r'\1ҡ'),
+            (re.compile(r'(\b|' + consonant + r')Қ'), r'\1Ҡ'),
+            # қ between vowels → х
+            (re.compile(r'([аәоөуүыиеэ])қ([аәоөуүыиеэ])'), r'\1х\2'),
+            (re.compile(r'([аәоөуүыиеэ])Қ([аәоөуүыиеэ])'), r'\1Х\2'),
+            # Final қ → ҡ
+            (re.compile(r'қ\b'), 'ҡ'),
+            (re.compile(r'Қ\b'), 'Ҡ'),
+        ]
+        
+        # Grammar endings and proper nouns are literal words/suffixes, so each
+        # rule set runs as one alternation regex in a single pass. The table
+        # holds each key's net result of applying the rules in order
+        def apply_grammar_patterns(text):
+            for pattern, replacement in self.grammar_patterns:
+                text = re.sub(pattern, replacement, text)
+            return text
+        
+        def apply_proper_nouns(text):
+            for word, capitalized in self.proper_nouns.items():
+                text = re.sub(rf'\b{word}\b', capitalized, text)
+                text = re.sub(rf'\b{word.title()}\b', capitalized, text)
+            return text
+        
+        self._grammar_regex, self._grammar_table = self._compile_rules(
+            [pattern[:-2] for pattern, _ in self.grammar_patterns],  # strip \b
+            apply_grammar_patterns
+        )
+        self._proper_noun_regex, self._proper_noun_table = self._compile_rules(
+            [w for word in self.proper_nouns for w in (word, word.title())],
+            apply_proper_nouns,
+            left=r'\b'
+        )
+    
+    @staticmethod
+    def _compile_rules(keys: List[str], rewrite, left: str = '') -> Tuple[re.Pattern, Dict[str, str]]:
+        """
+        Compile literal rule keys into one regex and a replacement table
+        
+        Args:
+            keys: Literal strings matched by the rules (each followed by \\b)
+            rewrite: Function applying the original rules in order
+            left: Pattern required before each key
+            
+        Returns:
+            (regex, {key: replacement}) with no-op keys left out
+        """
+        table = {}
+        for key in keys:
+            replaced = rewrite(key)
+            if replaced != key:
+                table[key] = replaced
+        
+        # Longest first so a key never loses to one of its prefixes
+        alternation = '|'.join(map(re.escape, sorted(table, key=len, reverse=True)))
+        return re.compile(left + '(?:' + alternation + r')\b'), table
     
     def _load_word_list(self, filename: str) -> Set[str]:
         """Load word list from file"""
@@ -236,34 +334,20 @@ class KazakhToBashkirCorrector:
     
     def _apply_char_replacements(self, text: str) -> str:
         """Apply single character replacements"""
-        result = text
-        
         # Apply character map
-        for kazakh_char, bashkir_char in self.char_map.items():
-            result = result.replace(kazakh_char, bashkir_char)
+        result = text.translate(self._char_table)
         
         # Handle қ conversions (context-sensitive)
-        # қ at beginning or after consonant → ҡ
-        result = re.sub(r'(\b|[' + re.escape('бвгджзйлмнпрстфхцчшщң') + r'])қ', r'\1ҡ', result)
-        result = re.sub(r'(\b|[' + re.escape('бвгджзйлмнпрстфхцчшщң') + r'])Қ', r'\1Ҡ', result)
-        
-        # қ between vowels → х
-        result = re.sub(r'([аәоөуүыиеэ])қ([аәоөуүыиеэ])', r'\1х\2', result)
-        result = re.sub(r'([аәоөуүыиеэ])Қ([аәоөуүыиеэ])', r'\1Х\2', result)
-        
-        # Final қ → ҡ
-        result = re.sub(r'қ\b', 'ҡ', result)
-        result = re.sub(r'Қ\b', 'Ҡ', result)
+        for pattern, replacement in self._q_rules:
+            result = pattern.sub(replacement, result)
         
         return result
     
     def _apply_grammar_corrections(self, text: str) -> str:
         """Apply grammar-specific corrections"""
-        result = text
-        
         # Apply grammar patterns
-        for pattern, replacement in self.grammar_patterns:
-            result = re.sub(pattern, replacement, result)
+        table = self._grammar_table
+        result = self._grammar_regex.sub(lambda m: table[m.group()], text)
         
         # Fix vowel harmony
         result = self._fix_vowel_harmony(result)
@@ -274,48 +358,17 @@ class KazakhToBashkirCorrector:
         """Fix vowel harmony in word endings"""
         result = text
         
-        # Back vowels (а, о, у, ы) + front ending → back ending
-        back_vowel_patterns = [
-            (r'([аоуы])гә\b', r'\1га'),
-            (r'([аоуы])кә\b', r'\1ка'),
-            (r'([аоуы])ҙә\b', r'\1ҙа'),
-            (r'([аоуы])тә\b', r'\1та'),
-            (r'([аоуы])нән\b', r'\1нан'),
-            (r'([аоуы])ҙән\b', r'\1ҙан'),
-            (r'([аоуы])тән\b', r'\1тан'),
-        ]
-        
-        # Front vowels (ә, ө, ү, и, е) + back ending → front ending
-        front_vowel_patterns = [
-            (r'([әөүие])га\b', r'\1гә'),
-            (r'([әөүие])ка\b', r'\1кә'),
-            (r'([әөүие])ҙа\b', r'\1ҙә'),
-            (r'([әөүие])та\b', r'\1тә'),
-            (r'([әөүие])нан\b', r'\1нән'),
-            (r'([әөүие])ҙан\b', r'\1ҙән'),
-            (r'([әөүие])тан\b', r'\1тән'),
-        ]
-        
-        # Apply back vowel patterns
-        for pattern, replacement in back_vowel_patterns:
-            result = re.sub(pattern, replacement, result)
-        
-        # Apply front vowel patterns
-        for pattern, replacement in front_vowel_patterns:
-            result = re.sub(pattern, replacement, result)
+        # Apply back vowel patterns, then front vowel patterns
+        for pattern, replacement in self._vowel_harmony_rules:
+            result = pattern.sub(replacement, result)
         
         return result
     
     def _capitalize_proper_nouns(self, text: str) -> str:
         """Capitalize proper nouns"""
-        result = text
-        
-        for word, capitalized in self.proper_nouns.items():
-            # Whole word
-            result = re.sub(rf'\b{word}\b', capitalized, result)
-            result = re.sub(rf'\b{word.title()}\b', capitalized, result)
-        
-        return result
+        # Whole words only
+        table = self._proper_noun_table
+        return self._proper_noun_regex.sub(lambda m: table[m.group()], text)
     
     def _apply_sentence_capitalization(self, text: str) -> str:
         """Apply proper sentence capitalization"""
@@ -391,18 +444,104 @@ class KazakhToBashkirCorrector:
         
         return result
     
-    def batch_correct(self, texts: List[str], aggressive: bool = False) -> List[str]:
+    def correct_lines(self, lines: Iterable[str], aggressive: bool = False) -> Iterator[str]:
+        """
+        Correct text read line by line, yielding corrected chunks
+        
+        Lines are buffered until one ends a sentence (., ! or ?) outside any
+        [...] or (...) span, so each chunk starts a new sentence and is
+        corrected the same way as in a single correct_orthography call over
+        the whole text, including bracketed artifacts that cross lines.
+        Quotes take no part in any rule and never hold a chunk back. Only
+        one sentence's worth of text is held in memory at a time (an
+        unclosed bracket keeps buffering until it closes).
+        
+        Unlike correct_orthography, blank-only input yields nothing rather
+        than echoing the whitespace back.
+        
+        Args:
+            lines: Iterable of input lines (e.g. an open file)
+            aggressive: Whether to apply aggressive corrections
+            
+        Yields:
+            Corrected chunks; join them with ' ' for the full text
+        """
+        buffer = []
+        for line in lines:
+            buffer.append(line)
+            if not line.rstrip().endswith(('.', '!', '?')):
+                continue
+            text = ' '.join(buffer)
+            if self._has_open_span(text):
+                continue
+            corrected = self.correct_orthography(text, aggressive)
+            buffer = []
+            if corrected.strip():
+                yield corrected
+        
+        if buffer:
+            corrected = self.correct_orthography(' '.join(buffer), aggressive)
+            if corrected.strip():
+                yield corrected
+    
+    @staticmethod
+    def _has_open_span(text: str) -> bool:
+        """Check whether _normalize_text would strip a span running past the end of text"""
+        if text.rfind('[') > text.rfind(']'):
+            return True
+        # Parentheses are stripped after brackets, so look at what is left
+        text = re.sub(r'\[.*?\]', '', text, flags=re.S)
+        return text.rfind('(') > text.rfind(')')
+    
+    def batch_correct(self, texts: List[str], aggressive: bool = False,
+                      capitalize: bool = True) -> List[str]:
         """
         Correct multiple texts
         
+        The texts are joined with BATCH_SEPARATOR and corrected in a single
+        pass, then split back apart. Falls back to correcting each text on
+        its own if the separator already occurs in the input or a rule
+        consumed one (e.g. a bracketed span crossing two texts).
+        
         Args:
             texts: List of input texts
             aggressive: Whether to apply aggressive corrections
+            capitalize: Capitalize each text as if corrected on its own. With
+                False, texts keep the sentence capitalization of the joined
+                pass, so join_corrected() of them matches correcting the whole
+                text (except in the per-text fallback). With None, no text is
+                capitalized at its start, for callers that cache results and
+                apply sentence_case() in transcript order themselves
             
         Returns:
             List of corrected texts
         """
-        return [self.correct_orthography(text, aggressive) for text in texts]
+        sep = self.BATCH_SEPARATOR
+        
+        # Blank texts are returned unchanged, as correct_orthography does
+        indices = [i for i, text in enumerate(texts) if text.strip()]
+        if not indices or any(sep in texts[i] for i in indices):
+            return [self.correct_orthography(text, aggressive) for text in texts]
+        
+        # A leading separator keeps the first text off the start of the
+        # joined text too, where it would be capitalized
+        joined = ''.join(f'{sep} {texts[i]} ' for i in indices)
+        parts = self.correct_orthography(joined, aggressive).split(sep)
+        if len(parts) != len(indices) + 1 or parts[0].strip():
+            return [self.correct_orthography(text, aggressive) for text in texts]
+        
+        results = list(texts)
+        for i, part in zip(indices, parts[1:]):
+            results[i] = part.strip()
+        
+        # Each text starts a sentence when corrected on its own; in context,
+        # only when the previous text ended one (the joined pass sees the
+        # separator, not the first letter, at that point)
+        if capitalize:
+            return [text[:1].upper() + text[1:] for text in results]
+        if capitalize is None:
+            return results
+        return sentence_case(results)[0]
 
 
 class WhisperTranscriber:
@@ -726,6 +865,17 @@ def run_test_cases():
 
 
 # Convenience functions for programmatic use
+_default_corrector = None
+
+
+def _get_default_corrector() -> KazakhToBashkirCorrector:
+    """Shared corrector for the convenience functions (built on first use)"""
+    global _default_corrector
+    if _default_corrector is None:
+        _default_corrector = KazakhToBashkirCorrector()
+    return _default_corrector
+
+
 def correct_orthography(text: str, aggressive: bool = False) -> str:
     """
     Correct Kazakh orthography to Bashkir
@@ -737,23 +887,123 @@ def correct_orthography(text: str, aggressive: bool = False) -> str:
     Returns:
         Text with corrected Bashkir orthography
     """
-    corrector = KazakhToBashkirCorrector()
-    return corrector.correct_orthography(text, aggressive)
+    return _get_default_corrector().correct_orthography(text, aggressive)
 
 
-def batch_correct(texts: List[str], aggressive: bool = False) -> List[str]:
+def batch_correct(texts: List[str], aggressive: bool = False,
+                  capitalize: Optional[bool] = True) -> List[str]:
     """
     Correct multiple texts
     
     Args:
         texts: List of input texts
         aggressive: Whether to apply aggressive corrections
+        capitalize: Capitalize each text on its own (False keeps the
+            capitalization of the joined text, None capitalizes no text)
     
     Returns:
         List of corrected texts
     """
-    corrector = KazakhToBashkirCorrector()
-    return corrector.batch_correct(texts, aggressive)
+    return _get_default_corrector().batch_correct(texts, aggressive, capitalize)
+
+
+def sentence_case(parts: List[str], starts_sentence: bool = True) -> Tuple[List[str], bool]:
+    """
+    Capitalize texts corrected in context the way the whole text would be
+    
+    A text is capitalized only when the text before it ended a sentence.
+    Pass the returned flag back in to continue with the next batch.
+    
+    Args:
+        parts: Consecutive texts from batch_correct(..., capitalize=None)
+        starts_sentence: Whether the first text starts a sentence
+    
+    Returns:
+        Tuple of (capitalized texts, whether the next text starts a sentence)
+    """
+    results = []
+    for part in parts:
+        if starts_sentence:
+            part = part[:1].upper() + part[1:]
+        if part.strip():
+            starts_sentence = part.rstrip().endswith(('.', '!', '?'))
+        results.append(part)
+    return results, starts_sentence
+
+
+def join_corrected(parts: List[str]) -> str:
+    """
+    Join batch_correct(..., capitalize=False) results into one text
+    
+    Spacing follows correct_orthography's formatting: punctuation that
+    opens a part attaches to the previous word, and is separated by a
+    space from previous punctuation.
+    
+    Args:
+        parts: Texts corrected in context
+    
+    Returns:
+        The full corrected text
+    """
+    pieces = []
+    for part in parts:
+        if not part:
+            continue
+        if pieces and (part[0] not in ',.:;!?' or pieces[-1][-1] in ',.:;!?'):
+            pieces.append(' ')
+        pieces.append(part)
+    return ''.join(pieces)
+
+
+# Kazakh letters the corrector rewrites, tracked in correction statistics
+# (label → letter forms); see char_map and the қ rules
+TRACKED_LETTERS = {
+    'ұ→у': 'ұҰ',
+    'ү→ө': 'үҮ',
+    'і→е': 'іІ',
+    'қ→ҡ/х': 'қҚ',
+}
+
+
+def count_differences(original_counts: Counter, corrected_counts: Counter) -> Dict[str, int]:
+    """
+    Correction statistics from character counts
+    
+    Counts can be accumulated segment by segment (Counter.update) so
+    statistics for a long transcript never need the full text in memory.
+    
+    Args:
+        original_counts: Character counts of the original text
+        corrected_counts: Character counts of the corrected text
+    
+    Returns:
+        Dictionary with text lengths, per-letter removals and
+        total_chars_changed (original characters missing after correction)
+    """
+    stats = {
+        'original_length': sum(original_counts.values()),
+        'corrected_length': sum(corrected_counts.values()),
+    }
+    for label, letters in TRACKED_LETTERS.items():
+        before = sum(original_counts[c] for c in letters)
+        after = sum(corrected_counts[c] for c in letters)
+        stats[label] = max(before - after, 0)
+    stats['total_chars_changed'] = sum((original_counts - corrected_counts).values())
+    return stats
+
+
+def analyze_differences(original: str, corrected: str) -> Dict[str, int]:
+    """
+    Compare original and corrected text
+    
+    Args:
+        original: Text before correction
+        corrected: Text after correction
+    
+    Returns:
+        Dictionary of correction statistics (see count_differences)
+    """
+    return count_differences(Counter(original), Counter(corrected))
 
 
 if __name__ == "__main__":
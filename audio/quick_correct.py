@@ -14,48 +14,53 @@ USAGE:
 import sys
 import re
 from pathlib import Path
-from kazakh_to_bashkir_corrector import correct_orthography
+from kazakh_to_bashkir_corrector import KazakhToBashkirCorrector
 
-def clean_transcription_artifacts(text: str) -> str:
-    """Remove timestamp/pipe artifacts from transcribed text."""
-    lines = text.splitlines()
-    cleaned_lines = []
+_ARTIFACT_LINE = re.compile(r'[\d\s,\.\-\(\)\[\]\:]+')
+
+def clean_transcription_line(line: str):
+    """Strip timestamp/pipe artifacts from one line; None if nothing is left."""
+    line = line.strip()
+    if not line:
+        return None
+
+    # Extract text after last '|' if present
+    if '|' in line:
+        line = line.split('|', 1)[-1].strip()
+
+    if not line:
+        return None
 
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
+    # Skip lines that are only numbers, commas, brackets, etc.
+    if _ARTIFACT_LINE.fullmatch(line):
+        return None
 
-        # Extract text after last '|' if present
-        if '|' in line:
-            line = line.split('|', 1)[-1].strip()
+    return line
 
-        if not line:
-            continue
 
-        # Skip lines that are only numbers, commas, brackets, etc.
-        if re.fullmatch(r'[\d\s,\.\-\(\)\[\]\:]+', line):
-            continue
+def clean_transcription_artifacts(text: str) -> str:
+    """Remove timestamp/pipe artifacts from transcribed text."""
+    cleaned = (clean_transcription_line(line) for line in text.splitlines())
+    return '\n'.join(line for line in cleaned if line)
 
-        cleaned_lines.append(line)
 
-    return '\n'.join(cleaned_lines)
+_corrector = KazakhToBashkirCorrector()
 
 
 def process_file(input_file: Path):
     """Process a single .txt file."""
     print(f"\n📁 Processing: {input_file.name}")
     
-    with open(input_file, 'r', encoding='utf-8') as f:
-        original_text = f.read()
-
-    cleaned_text = clean_transcription_artifacts(original_text)
-    corrected_text = correct_orthography(cleaned_text)
-    single_line = re.sub(r'\s+', ' ', corrected_text).strip()
-
     output_file = input_file.parent / f"{input_file.stem}_CORRECTED_ONELINE{input_file.suffix}"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(single_line)
+
+    # Stream cleaned lines through the corrector sentence by sentence
+    with open(input_file, 'r', encoding='utf-8') as fin, \
+         open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as fout:
+        cleaned = (clean_transcription_line(line) for line in fin)
+        for i, chunk in enumerate(_corrector.correct_lines(line for line in cleaned if line)):
+            if i:
+                fout.write(' ')
+            fout.write(' '.join(chunk.split()))
 
     print(f"✅ Saved: {output_file.name}")
 
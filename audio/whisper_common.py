@@ -0,0 +1,51 @@
+"""
+Shared faster-whisper settings and model loading for the transcription scripts
+"""
+
+import os
+from pathlib import Path
+
+# Downloaded CTranslate2 models are kept here and reused offline on later runs
+WHISPER_MODEL_DIR = os.environ.get("WHISPER_MODEL_DIR", str(Path.home() / ".cache" / "whisper-ct2"))
+
+# Greedy decoding without conditioning on previous text (default): several
+# times faster than beam search and less prone to repetition loops on long audio
+FAST_DECODE_OPTIONS = {
+    "beam_size": 1,
+    "best_of": 1,
+    "condition_on_previous_text": False,
+    "temperature": 0.0,
+    "no_speech_threshold": 0.6,
+    "compression_ratio_threshold": 2.4,
+}
+
+# --quality: full beam search for best long-form accuracy
+QUALITY_DECODE_OPTIONS = {
+    "beam_size": 5,
+    "condition_on_previous_text": True,
+}
+
+
+def load_whisper_model(model_size: str, **kwargs):
+    """
+    Load a faster-whisper model from WHISPER_MODEL_DIR
+    
+    The cached copy is loaded without contacting the Hugging Face Hub; the
+    model is only downloaded when it is not cached yet. Any other load
+    error (CUDA, memory, unsupported compute_type) is raised as is.
+    
+    Args:
+        model_size: Whisper model size or local model path
+        **kwargs: Passed to WhisperModel (device, compute_type, cpu_threads, ...)
+    
+    Returns:
+        Loaded WhisperModel
+    """
+    from faster_whisper import WhisperModel
+    from huggingface_hub.utils import LocalEntryNotFoundError
+    
+    kwargs.setdefault("download_root", WHISPER_MODEL_DIR)
+    try:
+        return WhisperModel(model_size, local_files_only=True, **kwargs)
+    except LocalEntryNotFoundError:
+        return WhisperModel(model_size, **kwargs)
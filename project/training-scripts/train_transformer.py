@@ -11,13 +11,11 @@ Requirements:
 """
 
 import os
-import pandas as pd
 import torch
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import StratifiedShuffleSplit
 from sklearn.metrics import accuracy_score, precision_recall_fscore_support, confusion_matrix
 import numpy as np
 
-# Install dependencies if needed
 try:
     from datasets import Dataset
     from transformers import (
@@ -27,18 +25,9 @@ try:
         Trainer
     )
 except ImportError:
-    print("Installing required packages...")
-    import subprocess, sys
-    subprocess.check_call([
-        sys.executable, "-m", "pip", "install",
-        "transformers", "torch", "datasets", "sklearn", "accelerate"
-    ])
-    from datasets import Dataset
-    from transformers import (
-        AutoTokenizer,
-        AutoModelForSequenceClassification,
-        TrainingArguments,
-        Trainer
+    raise SystemExit(
+        "❌ transformers/datasets not installed. "
+        "Enable the Transformer section in requirements.txt and run: pip install -r requirements.txt"
     )
 
 def load_turkic_data(bashkir_file, kazakh_file, kyrgyz_file):
@@ -60,61 +49,49 @@ def load_turkic_data(bashkir_file, kazakh_file, kyrgyz_file):
     print(f"  Kazakh: {len(kazakh_texts)} samples")
     print(f"  Kyrgyz: {len(kyrgyz_texts)} samples")
     
-    # Create labeled dataset
-    data = []
-    
     # Label mapping: 0 = Bashkir, 1 = Kazakh, 2 = Kyrgyz
-    for text in bashkir_texts:
-        data.append({'text': text, 'label': 0, 'language': 'bashkir'})
-    
-    for text in kazakh_texts:
-        data.append({'text': text, 'label': 1, 'language': 'kazakh'})
-    
-    for text in kyrgyz_texts:
-        data.append({'text': text, 'label': 2, 'language': 'kyrgyz'})
+    texts = bashkir_texts + kazakh_texts + kyrgyz_texts
+    labels = np.repeat([0, 1, 2], [len(bashkir_texts), len(kazakh_texts), len(kyrgyz_texts)])
     
-    # Convert to DataFrame
-    df = pd.DataFrame(data)
+    print(f"\n✓ Total samples: {len(texts)}")
     
-    print(f"\n✓ Total samples: {len(df)}")
-    
-    return df
+    return texts, labels
 
-def split_data(df):
-    """Split data into train/val/test sets"""
+def split_data(labels):
+    """Split data into train/val/test sets, returned as index arrays"""
     
     print("\n📊 Splitting data...")
     
     # Split: 70% train, 15% val, 15% test
-    train_df, temp_df = train_test_split(
-        df, 
-        test_size=0.3, 
-        stratify=df['label'], 
-        random_state=42
-    )
+    sss = StratifiedShuffleSplit(n_splits=1, test_size=0.3, random_state=42)
+    (train_idx, temp_idx), = sss.split(np.zeros(len(labels)), labels)
     
-    val_df, test_df = train_test_split(
-        temp_df, 
-        test_size=0.5, 
-        stratify=temp_df['label'], 
-        random_state=42
-    )
+    sss = StratifiedShuffleSplit(n_splits=1, test_size=0.5, random_state=42)
+    (val_pos, test_pos), = sss.split(np.zeros(len(temp_idx)), labels[temp_idx])
+    val_idx = temp_idx[val_pos]
+    test_idx = temp_idx[test_pos]
     
-    print(f"  Train: {len(train_df)} samples")
-    print(f"  Val: {len(val_df)} samples")
-    print(f"  Test: {len(test_df)} samples")
+    print(f"  Train: {len(train_idx)} samples")
+    print(f"  Val: {len(val_idx)} samples")
+    print(f"  Test: {len(test_idx)} samples")
     
-    return train_df, val_df, test_df
+    return train_idx, val_idx, test_idx
 
-def prepare_datasets(train_df, val_df, test_df, tokenizer):
-    """Convert DataFrames to HuggingFace Datasets and tokenize"""
+def prepare_datasets(texts, labels, train_idx, val_idx, test_idx, tokenizer):
+    """Build HuggingFace Datasets from the split indices and tokenize"""
     
     print("\n🔤 Tokenizing datasets...")
     
     # Convert to HuggingFace Dataset format
-    train_dataset = Dataset.from_pandas(train_df[['text', 'label']])
-    val_dataset = Dataset.from_pandas(val_df[['text', 'label']])
-    test_dataset = Dataset.from_pandas(test_df[['text', 'label']])
+    def to_dataset(idx):
+        return Dataset.from_dict({
+            'text': [texts[i] for i in idx],
+            'label': labels[idx]
+        })
+    
+    train_dataset = to_dataset(train_idx)
+    val_dataset = to_dataset(val_idx)
+    test_dataset = to_dataset(test_idx)
     
     # Tokenize
     def tokenize_function(examples):
@@ -133,10 +110,16 @@ def prepare_datasets(train_df, val_df, test_df, tokenizer):
     
     return train_dataset, val_dataset, test_dataset
 
+def preprocess_logits_for_metrics(logits, labels):
+    """Reduce logits to class ids on-device so eval only gathers (N,) ints"""
+    if isinstance(logits, tuple):
+        logits = logits[0]
+    return logits.argmax(dim=-1)
+
 def compute_metrics(pred):
     """Compute metrics for evaluation"""
     labels = pred.label_ids
-    preds = pred.predictions.argmax(-1)
+    preds = pred.predictions  # already argmaxed by preprocess_logits_for_metrics
     
     precision, recall, f1, _ = precision_recall_fscore_support(
         labels, preds, average='weighted'
@@ -163,13 +146,21 @@ def train_model(train_dataset, val_dataset, model, output_dir='./turkic_classifi
     if device == 'cpu':
         print("  ⚠️  Training on CPU will be slow. GPU recommended!")
     
+    # Recompute activations in backward to fit larger batches in memory
+    model.gradient_checkpointing_enable()
+    model.config.use_cache = False
+    
     # Training arguments
     training_args = TrainingArguments(
         output_dir=output_dir,
         num_train_epochs=3,
-        per_device_train_batch_size=8,
+        per_device_train_batch_size=32,
         per_device_eval_batch_size=8,
-        warmup_steps=500,
+        gradient_accumulation_steps=1,
+        gradient_checkpointing=True,
+        dataloader_num_workers=4,
+        dataloader_pin_memory=True,
+        warmup_ratio=0.1,
         weight_decay=0.01,
         logging_dir=f'{output_dir}/logs',
         logging_steps=50,
@@ -186,6 +177,7 @@ def train_model(train_dataset, val_dataset, model, output_dir='./turkic_classifi
         train_dataset=train_dataset,
         eval_dataset=val_dataset,
         compute_metrics=compute_metrics,
+        preprocess_logits_for_metrics=preprocess_logits_for_metrics,
     )
     
     # Train!
@@ -202,15 +194,16 @@ def evaluate_detailed(trainer, test_dataset, label_names):
     
     # Get predictions
     predictions = trainer.predict(test_dataset)
-    preds = predictions.predictions.argmax(-1)
+    preds = predictions.predictions  # already argmaxed by preprocess_logits_for_metrics
     labels = predictions.label_ids
     
     # Overall metrics
+    precision, recall, f1, _ = precision_recall_fscore_support(labels, preds, average='weighted')
     results = {
         'accuracy': accuracy_score(labels, preds),
-        'precision': precision_recall_fscore_support(labels, preds, average='weighted')[0],
-        'recall': precision_recall_fscore_support(labels, preds, average='weighted')[1],
-        'f1': precision_recall_fscore_support(labels, preds, average='weighted')[2],
+        'precision': precision,
+        'recall': recall,
+        'f1': f1,
     }
     
     print("\n🎯 Test Results:")
@@ -226,9 +219,15 @@ def evaluate_detailed(trainer, test_dataset, label_names):
     for i, row in enumerate(cm):
         print(f"{label_names[i]:8}", "  ".join([f"{val:8}" for val in row]))
     
-    # Per-class metrics
+    # Per-class metrics (derived from the confusion matrix)
     print("\n📋 Per-Class Metrics:")
-    precision, recall, f1, support = precision_recall_fscore_support(labels, preds)
+    true_pos = np.diag(cm)
+    predicted = cm.sum(axis=0)
+    support = cm.sum(axis=1)
+    precision = np.divide(true_pos, predicted, out=np.zeros(len(cm)), where=predicted > 0)
+    recall = np.divide(true_pos, support, out=np.zeros(len(cm)), where=support > 0)
+    pr_sum = precision + recall
+    f1 = np.divide(2 * precision * recall, pr_sum, out=np.zeros(len(cm)), where=pr_sum > 0)
     
     for i, name in enumerate(label_names):
         print(f"\n  {name.capitalize()}:")
@@ -258,6 +257,9 @@ def test_predictions(model, tokenizer, label_names):
     model.to(device)
     model.eval()
     
+    # fp16 autocast on GPU; weights stay fp32 since main() saves this model
+    use_fp16 = device == 'cuda'
+    
     correct = 0
     for text, expected_lang in test_examples:
         # Tokenize
@@ -270,9 +272,9 @@ def test_predictions(model, tokenizer, label_names):
         ).to(device)
         
         # Predict
-        with torch.no_grad():
+        with torch.inference_mode(), torch.autocast(device_type=device, dtype=torch.float16, enabled=use_fp16):
             outputs = model(**inputs)
-            predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
+            predictions = torch.nn.functional.softmax(outputs.logits.float(), dim=-1)
             predicted_class = torch.argmax(predictions, dim=-1).item()
             confidence = predictions[0][predicted_class].item()
         
@@ -309,10 +311,10 @@ def main():
             return
     
     # Load data
-    df = load_turkic_data(bashkir_file, kazakh_file, kyrgyz_file)
+    texts, labels = load_turkic_data(bashkir_file, kazakh_file, kyrgyz_file)
     
     # Split data
-    train_df, val_df, test_df = split_data(df)
+    train_idx, val_idx, test_idx = split_data(labels)
     
     # Label names
     label_names = ['bashkir', 'kazakh', 'kyrgyz']
@@ -329,7 +331,7 @@ def main():
     
     # Prepare datasets
     train_dataset, val_dataset, test_dataset = prepare_datasets(
-        train_df, val_df, test_df, tokenizer
+        texts, labels, train_idx, val_idx, test_idx, tokenizer
     )
     
     # Load model
@@ -6,7 +6,7 @@ Train Turkic Language Classifier and Save as .pkl
 import pickle
 from pathlib import Path
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import SGDClassifier
 from sklearn.pipeline import Pipeline
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, confusion_matrix
@@ -14,10 +14,7 @@ from sklearn.metrics import classification_report, confusion_matrix
 try:
     from datasets import load_dataset
 except ImportError:
-    import subprocess, sys
-    print("📦 Installing datasets library...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "datasets"])
-    from datasets import load_dataset
+    raise SystemExit("❌ datasets not installed. Run: pip install -r requirements.txt")
 
 print("=" * 70)
 print("TURKIC LANGUAGE CLASSIFIER TRAINING")
@@ -100,19 +97,23 @@ model = Pipeline([
         min_df=2,
         lowercase=True
     )),
-    ('classifier', LogisticRegression(
-        max_iter=1000,
+    ('classifier', SGDClassifier(
+        loss='log_loss',  # keeps predict_proba for the probability output
+        alpha=1e-5,
+        max_iter=20,
+        early_stopping=True,
+        validation_fraction=0.05,
+        n_jobs=-1,
         random_state=42
-        # Removed multi_class and solver parameters for compatibility
     ))
 ])
 
 print("   ✅ Pipeline created:")
 print("      1. TF-IDF Vectorizer (char n-grams 2-5)")
-print("      2. Logistic Regression")
+print("      2. SGD Classifier (log-loss)")
 
 print("\n🎓 Training model...")
-print("   This may take 30-60 seconds...")
+print("   This may take a few seconds...")
 
 model.fit(X_train, y_train)
 
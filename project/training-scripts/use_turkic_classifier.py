@@ -6,6 +6,10 @@ Load and use the trained model to classify new texts.
 """
 
 import pickle
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
 
 # Load the model
 print("Loading model...")
@@ -20,20 +24,95 @@ print("✓ Model loaded!\n")
 # Label mapping
 label_names = ['bashkir', 'kazakh', 'kyrgyz']
 
-def classify_text(text):
-    """Classify a single text"""
-    # Vectorize
-    X = vectorizer.transform([text])
+class BatchedClassifier:
+    """
+    Collect concurrent classification requests and run them as one batch
     
-    # Predict
-    prediction = model.predict(X)[0]
-    probabilities = model.predict_proba(X)[0]
+    A background worker waits for up to max_batch pending texts (or
+    max_wait_ms after the first one arrives), then vectorizes and predicts
+    them together so the TF-IDF transform and predict_proba run once per
+    batch instead of once per text. A caller with no other request in
+    flight is classified directly, without waiting for the batch window.
+    """
+    
+    def __init__(self, model, vectorizer, max_batch=64, max_wait_ms=5):
+        self.model = model
+        self.vectorizer = vectorizer
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        
+        self._pending = deque()
+        self._callers = 0  # threads currently inside classify()
+        self._cond = threading.Condition()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+    
+    def submit(self, text):
+        """Queue a text and return a Future for (language, confidence, probabilities)"""
+        future = Future()
+        with self._cond:
+            self._pending.append((text, future))
+            self._cond.notify()
+        return future
+    
+    def classify(self, text):
+        """Classify one text, batching it only with concurrent callers"""
+        with self._cond:
+            direct = self._callers == 0 and not self._pending
+            self._callers += 1
+        try:
+            if direct:
+                X = self.vectorizer.transform([text])
+                return self._result(self.model.predict_proba(X)[0])
+            return self.submit(text).result()
+        finally:
+            with self._cond:
+                self._callers -= 1
     
-    # Get language name
-    language = label_names[prediction]
-    confidence = probabilities[prediction]
+    @staticmethod
+    def _result(probs):
+        prediction = int(probs.argmax())
+        return label_names[prediction], probs[prediction], probs
     
-    return language, confidence, probabilities
+    def _next_batch(self):
+        """Block until a batch is ready and pop it from the queue"""
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            
+            # Give other callers a short window to join this batch
+            deadline = time.monotonic() + self.max_wait
+            while len(self._pending) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            
+            size = min(self.max_batch, len(self._pending))
+            return [self._pending.popleft() for _ in range(size)]
+    
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            texts = [text for text, _ in batch]
+            
+            try:
+                X = self.vectorizer.transform(texts)
+                probabilities = self.model.predict_proba(X)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            
+            for (_, future), probs in zip(batch, probabilities):
+                future.set_result(self._result(probs))
+
+
+_batcher = BatchedClassifier(model, vectorizer)
+
+def classify_text(text):
+    """Classify a single text"""
+    return _batcher.classify(text)
 
 def classify_batch(texts):
     """Classify multiple texts"""
@@ -1,31 +1,43 @@
-import re
 import os
+import sys
+from pathlib import Path
+
+# Shared helpers live next to the other cleaners in audio/
+sys.path.append(str(Path(__file__).resolve().parent.parent / "audio"))
+from cyrillic_letters import CYRILLIC_LETTERS, count_letters, utf8_letter_pattern
 
 input_path = r"\\system-files\G\Bashqort\turkic_classification_results_kyrgyz.txt"
 output_path = r"\\system-files\G\Bashqort\kyrgyz_clean_cyrillic.txt"
 
-def is_meaningful_kyrgyz(text):
-    if not text.strip():
+# Kyrgyz Cyrillic: includes ә, ң, ө, ү, and often г/к/ч for ғ/к̌/ч̌
+KYRGYZ_LETTERS = CYRILLIC_LETTERS + 'әңөүӘҢӨҮ'
+
+# Lines are matched as raw UTF-8 bytes, so they never need decoding
+KYRGYZ_PATTERN = utf8_letter_pattern(KYRGYZ_LETTERS)
+
+def is_meaningful_kyrgyz(line):
+    if isinstance(line, str):
+        line = line.encode('utf-8')
+    if not line.strip():
         return False
-    # Kyrgyz Cyrillic: includes ә, ң, ө, ү, and often г/к/ч for ғ/к̌/ч̌
-    kyrgyz_pattern = re.compile(r'[а-яА-ЯәңөүӘҢӨҮ]+')
-    matches = kyrgyz_pattern.findall(text)
-    total_cyrillic = sum(len(word) for word in matches)
+    total_cyrillic = count_letters(KYRGYZ_PATTERN, line)
+    # Require at least 3 Cyrillic letters total
     return total_cyrillic >= 3
 
 def clean_kyrgyz_file(input_file, output_file):
-    with open(input_file, 'r', encoding='utf-8') as f:
+    with open(input_file, 'rb') as f:
         lines = f.readlines()
 
     cleaned = []
     for line in lines:
-        if "Sample" in line and "=" in line:
+        if b"Sample" in line and b"=" in line:
             continue
         if is_meaningful_kyrgyz(line):
             cleaned.append(line.strip())
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("\n".join(cleaned))
+    # Platform line endings, as the text-mode writer produced
+    with open(output_file, 'wb') as f:
+        f.write(os.linesep.encode().join(cleaned))
 
 if __name__ == "__main__":
     clean_kyrgyz_file(input_path, output_path)
@@ -18,7 +18,6 @@ EXAMPLE:
     python clean_vad_transcript.py audio_clip_vad.txt audio_clip_cleaned.txt
 """
 
-import re
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -44,16 +43,20 @@ def parse_timestamp_line(line: str) -> tuple:
     Returns:
         (timestamp, text) tuple
     """
-    # Match timestamp at start: HH:MM:SS
-    match = re.match(r'^(\d{2}:\d{2}:\d{2})\s*(.*)$', line)
-    
-    if match:
-        timestamp = match.group(1)
-        text = match.group(2).strip()
-        return timestamp, text
-    else:
-        # No timestamp found, return entire line as text
-        return None, line.strip()
+    # Fixed-width HH:MM:SS at start: colons at 2 and 5, digits elsewhere
+    # (isdecimal() accepts the same characters as regex \d)
+    if (
+        len(line) >= 8
+        and line[2] == ':'
+        and line[5] == ':'
+        and line[:2].isdecimal()
+        and line[3:5].isdecimal()
+        and line[6:8].isdecimal()
+    ):
+        return line[:8], line[8:].strip()
+    
+    # No timestamp found, return entire line as text
+    return None, line.strip()
 
 
 def clean_vad_transcript(
@@ -103,26 +106,23 @@ def clean_vad_transcript(
     print("STEP 1: Reading and Parsing")
     print("=" * 80)
     
+    # Parse each line as it is read into parallel timestamp/text lists
+    timestamps = []
+    texts = []
+    line_count = 0
     with open(input_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-    
-    print(f"✅ Read {len(lines)} lines")
-    
-    # Parse each line
-    segments = []
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        
-        timestamp, text = parse_timestamp_line(line)
-        if text:  # Only add if there's actual text
-            segments.append({
-                'timestamp': timestamp,
-                'text': text
-            })
+        for line_count, raw in enumerate(f, 1):
+            line = raw.strip()
+            if not line:
+                continue
+            
+            timestamp, text = parse_timestamp_line(line)
+            if text:  # Only add if there's actual text
+                timestamps.append(timestamp)
+                texts.append(text)
     
-    print(f"✅ Parsed {len(segments)} segments with text")
+    print(f"✅ Read {line_count} lines")
+    print(f"✅ Parsed {len(texts)} segments with text")
     
     # Step 2: Combine text
     print(f"\n{'=' * 80}")
@@ -130,10 +130,11 @@ def clean_vad_transcript(
     print("=" * 80)
     
     # Combine all text (without timestamps)
-    all_text = ' '.join(seg['text'] for seg in segments)
+    all_text = ' '.join(texts)
+    word_count = len(all_text.split())
     
     print(f"✅ Extracted {len(all_text)} characters")
-    print(f"✅ Word count: {len(all_text.split())} words")
+    print(f"✅ Word count: {word_count} words")
     print()
     print("Preview (first 150 chars):")
     print("-" * 80)
@@ -175,24 +176,11 @@ def clean_vad_transcript(
     print("=" * 80)
     
     if apply_correction and CORRECTOR_AVAILABLE:
-        corrected_segments = []
-        for seg in segments:
-            corrected_seg = {
-                'timestamp': seg['timestamp'],
-                'original_text': seg['text'],
-                'corrected_text': corrector.correct_orthography(seg['text'], aggressive=aggressive)
-            }
-            corrected_segments.append(corrected_seg)
-        print(f"✅ Corrected {len(corrected_segments)} segments")
+        corrected = corrector.batch_correct(texts, aggressive=aggressive)
+        print(f"✅ Corrected {len(corrected)} segments")
     else:
-        corrected_segments = [
-            {
-                'timestamp': seg['timestamp'],
-                'text': seg['text']
-            }
-            for seg in segments
-        ]
-        print(f"✅ Processed {len(corrected_segments)} segments")
+        corrected = texts
+        print(f"✅ Processed {len(texts)} segments")
     
     # Step 5: Save outputs
     print(f"\n{'=' * 80}")
@@ -215,60 +203,69 @@ def clean_vad_transcript(
     
     # Save structured version with timestamps
     structured_file = output_dir / f"{base_name}_with_timestamps.txt"
-    with open(structured_file, 'w', encoding='utf-8') as f:
-        if apply_correction and CORRECTOR_AVAILABLE:
-            for seg in corrected_segments:
-                f.write(f"[{seg['timestamp']}]\n")
-                if seg['original_text'] != seg['corrected_text']:
-                    f.write(f"Original:  {seg['original_text']}\n")
-                    f.write(f"Corrected: {seg['corrected_text']}\n\n")
-                else:
-                    f.write(f"{seg['corrected_text']}\n\n")
-        else:
-            for seg in corrected_segments:
-                f.write(f"[{seg['timestamp']}] {seg['text']}\n")
+    parts = []
+    append = parts.append
+    segment_parts = []  # segment section of the comparison report
+    append_segment = segment_parts.append
+    if apply_correction and CORRECTOR_AVAILABLE:
+        # One pass fills both the structured file and the report section
+        for timestamp, original, fixed in zip(timestamps, texts, corrected):
+            header = f"[{timestamp}]\n"
+            append(header)
+            append_segment(header)
+            if original != fixed:
+                block = f"Original:  {original}\nCorrected: {fixed}\n\n"
+                append(block)
+                append_segment(block)
+            else:
+                append(f"{fixed}\n\n")
+                append_segment(f"Text: {fixed}\n\n")
+    else:
+        for timestamp, text in zip(timestamps, texts):
+            append(f"[{timestamp}] {text}\n")
+    with open(structured_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write(''.join(parts))
     print(f"✅ Saved structured: {structured_file.name}")
     
     # Save comparison report (if correction applied)
     if apply_correction and CORRECTOR_AVAILABLE and stats:
         report_file = output_dir / f"{base_name}_comparison_report.txt"
         
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write("=" * 80 + "\n")
-            f.write("VAD TRANSCRIPT COMPARISON REPORT\n")
-            f.write("=" * 80 + "\n\n")
-            
-            f.write(f"Input File: {input_path.name}\n")
-            f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Segments: {len(segments)}\n\n")
-            
-            f.write("-" * 80 + "\n")
-            f.write("ORIGINAL TEXT (without timestamps)\n")
-            f.write("-" * 80 + "\n")
-            f.write(all_text + "\n\n")
-            
-            f.write("-" * 80 + "\n")
-            f.write("CORRECTED TEXT (Bashkir orthography)\n")
-            f.write("-" * 80 + "\n")
-            f.write(corrected_text + "\n\n")
-            
-            f.write("-" * 80 + "\n")
-            f.write("CORRECTION STATISTICS\n")
-            f.write("-" * 80 + "\n")
-            for key, value in stats.items():
-                f.write(f"{key:35}: {value}\n")
-            
-            f.write("\n" + "-" * 80 + "\n")
-            f.write("SEGMENTS WITH TIMESTAMPS\n")
-            f.write("-" * 80 + "\n\n")
-            
-            for seg in corrected_segments:
-                f.write(f"[{seg['timestamp']}]\n")
-                if seg['original_text'] != seg['corrected_text']:
-                    f.write(f"Original:  {seg['original_text']}\n")
-                    f.write(f"Corrected: {seg['corrected_text']}\n\n")
-                else:
-                    f.write(f"Text: {seg['corrected_text']}\n\n")
+        report_parts = []
+        append = report_parts.append
+        append("=" * 80 + "\n")
+        append("VAD TRANSCRIPT COMPARISON REPORT\n")
+        append("=" * 80 + "\n\n")
+        
+        append(f"Input File: {input_path.name}\n")
+        append(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        append(f"Segments: {len(texts)}\n\n")
+        
+        append("-" * 80 + "\n")
+        append("ORIGINAL TEXT (without timestamps)\n")
+        append("-" * 80 + "\n")
+        append(all_text)
+        append("\n\n")
+        
+        append("-" * 80 + "\n")
+        append("CORRECTED TEXT (Bashkir orthography)\n")
+        append("-" * 80 + "\n")
+        append(corrected_text)
+        append("\n\n")
+        
+        append("-" * 80 + "\n")
+        append("CORRECTION STATISTICS\n")
+        append("-" * 80 + "\n")
+        for key, value in stats.items():
+            append(f"{key:35}: {value}\n")
+        
+        append("\n" + "-" * 80 + "\n")
+        append("SEGMENTS WITH TIMESTAMPS\n")
+        append("-" * 80 + "\n\n")
+        
+        with open(report_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(''.join(report_parts))
+            f.write(''.join(segment_parts))
         
         print(f"✅ Saved report: {report_file.name}")
     
@@ -277,9 +274,9 @@ def clean_vad_transcript(
     print("SUMMARY")
     print("=" * 80)
     print(f"\n✅ Processing complete!")
-    print(f"📊 Segments: {len(segments)}")
+    print(f"📊 Segments: {len(texts)}")
     print(f"📝 Characters: {len(all_text)}")
-    print(f"📝 Words: {len(all_text.split())}")
+    print(f"📝 Words: {word_count}")
     
     if stats:
         print(f"🔧 Corrections: {stats['total_chars_changed']} characters changed")
@@ -296,8 +293,20 @@ def clean_vad_transcript(
     
     print(f"\n{'=' * 80}")
     
+    # Build per-segment dicts only for the caller
+    if apply_correction and CORRECTOR_AVAILABLE:
+        segments = [
+            {'timestamp': timestamp, 'original_text': original, 'corrected_text': fixed}
+            for timestamp, original, fixed in zip(timestamps, texts, corrected)
+        ]
+    else:
+        segments = [
+            {'timestamp': timestamp, 'text': text}
+            for timestamp, text in zip(timestamps, texts)
+        ]
+    
     return {
-        'segments': corrected_segments if apply_correction else segments,
+        'segments': segments,
         'original_text': all_text,
         'corrected_text': corrected_text,
         'statistics': stats,
@@ -9,24 +9,31 @@ def process_file():
     # Initialize the corrector
     corrector = KazakhToBashkirCorrector()
     
-    # Read the input file
-    with open('big_clip_file_corrected.txt', 'r', encoding='utf-8') as f:
-        text = f.read()
+    original_words = 0
+    corrected_words = 0
+    preview = ''
     
-    # Apply correction
-    corrected_text = corrector.correct_orthography(text)
+    def count_words(lines):
+        nonlocal original_words
+        for line in lines:
+            original_words += len(line.split())
+            yield line
     
-    # Save the corrected version
-    with open('big_clip_file_final.txt', 'w', encoding='utf-8') as f:
-        f.write(corrected_text)
+    # Stream the input through the corrector sentence by sentence
+    with open('big_clip_file_corrected.txt', 'r', encoding='utf-8') as fin, \
+         open('big_clip_file_final.txt', 'w', encoding='utf-8', buffering=1 << 20) as fout:
+        for i, chunk in enumerate(corrector.correct_lines(count_words(fin))):
+            if i:
+                fout.write(' ')
+            fout.write(chunk)
+            corrected_words += len(chunk.split())
+            if len(preview) <= 80:
+                preview = (preview + ' ' + chunk).lstrip()
     
     print("✅ File processed successfully!")
     print(f"Output saved to: big_clip_file_final.txt")
     
     # Show statistics
-    original_words = len(text.split())
-    corrected_words = len(corrected_text.split())
-    
     print(f"\n📊 Statistics:")
     print(f"  Original word count: {original_words}")
     print(f"  Corrected word count: {corrected_words}")
@@ -34,10 +41,8 @@ def process_file():
     # Show first few lines for verification
     print(f"\n📝 Preview of corrected text:")
     print("-" * 70)
-    lines = corrected_text.split('\n')
-    for i, line in enumerate(lines[:3]):
-        if line.strip():
-            print(f"Line {i+1}: {line[:80]}..." if len(line) > 80 else f"Line {i+1}: {line}")
+    if preview:
+        print(f"Line 1: {preview[:80]}..." if len(preview) > 80 else f"Line 1: {preview}")
 
 if __name__ == "__main__":
     process_file()
\ No newline at end of file
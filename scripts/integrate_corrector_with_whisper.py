@@ -16,10 +16,11 @@ from pathlib import Path
 # import whisper
 # import torch
 
-from kazakh_to_bashkir_corrector import correct_orthography, KazakhToBashkirCorrector
+from kazakh_to_bashkir_corrector import KazakhToBashkirCorrector
 
 
-def transcribe_and_correct(audio_path: str, model_size: str = "base", aggressive: bool = False):
+def transcribe_and_correct(audio_path: str, model_size: str = "base", aggressive: bool = False,
+                           corrector: KazakhToBashkirCorrector = None):
     """
     Transcribe audio with Whisper and correct Kazakh→Bashkir orthography
     
@@ -27,6 +28,7 @@ def transcribe_and_correct(audio_path: str, model_size: str = "base", aggressive
         audio_path: Path to audio file
         model_size: Whisper model size (tiny, base, small, medium, large)
         aggressive: Whether to apply aggressive corrections
+        corrector: Corrector instance to reuse (a new one is created if omitted)
     
     Returns:
         Dictionary with original and corrected transcriptions
@@ -45,7 +47,9 @@ def transcribe_and_correct(audio_path: str, model_size: str = "base", aggressive
     
     # Correct orthography
     print("Correcting orthography...")
-    corrected_text = correct_orthography(original_text, aggressive=aggressive)
+    if corrector is None:
+        corrector = KazakhToBashkirCorrector()
+    corrected_text = corrector.correct_orthography(original_text, aggressive=aggressive)
     
     return {
         "original": original_text,
@@ -70,7 +74,7 @@ def process_batch(audio_files: list, output_file: str = None):
         print(f"Processing: {audio_path}")
         print('='*70)
         
-        result = transcribe_and_correct(audio_path)
+        result = transcribe_and_correct(audio_path, corrector=corrector)
         results.append(result)
         
         print(f"\nOriginal:  {result['original']}")
@@ -135,11 +139,13 @@ if __name__ == "__main__":
     print("WHISPER + ORTHOGRAPHY CORRECTOR INTEGRATION EXAMPLES")
     print("="*70)
     
+    corrector = KazakhToBashkirCorrector()
+    
     print("\n📝 Example 1: Simple text correction")
     print("-"*70)
     
     test_text = "бұл менің құд диджитал құздан"
-    corrected = correct_orthography(test_text)
+    corrected = corrector.correct_orthography(test_text)
     print(f"Original:  {test_text}")
     print(f"Corrected: {corrected}")
     
@@ -151,7 +157,7 @@ if __name__ == "__main__":
     бұл қашмау қойыруқ кепкеға қойылған шул бұл менің заманлы ғам әлікле мәдіниет.
     """
     
-    corrected_para = correct_orthography(paragraph)
+    corrected_para = corrector.correct_orthography(paragraph)
     print("Original:")
     print(paragraph)
     print("\nCorrected:")
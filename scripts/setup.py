@@ -42,77 +42,105 @@ MODEL_FILES = {
 
 # =============== VERIFICATION ===============
 
+def count_lines(filepath, chunk_size=1 << 22):
+    """Count lines by scanning raw bytes for newlines (no UTF-8 decoding)"""
+    lines = 0
+    last = ord('\n')
+    buf = bytearray(chunk_size)  # reused for every read, no per-chunk allocation
+    with open(filepath, 'rb', buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            lines += (buf if n == chunk_size else buf[:n]).count(b'\n')
+            last = buf[n - 1]
+    # A final line without a trailing newline still counts
+    return lines + (last != ord('\n'))
+
 def verify_setup():
     """Verify that all paths and files exist"""
     
-    print("="*70)
-    print("SETUP VERIFICATION")
-    print("="*70)
+    # Collect the report and write it to stdout once at the end
+    out = []
+    
+    out.append("="*70)
+    out.append("SETUP VERIFICATION")
+    out.append("="*70)
     
     # Check base directory
-    print(f"\n📁 Base Directory: {BASE_DIR}")
+    out.append(f"\n📁 Base Directory: {BASE_DIR}")
     if BASE_DIR.exists():
-        print("   ✅ Exists")
+        out.append("   ✅ Exists")
     else:
-        print("   ❌ Does not exist!")
+        out.append("   ❌ Does not exist!")
+        sys.stdout.write("\n".join(out) + "\n")
         return False
     
     # Check data directory
-    print(f"\n📁 Data Directory: {DATA_DIR}")
+    out.append(f"\n📁 Data Directory: {DATA_DIR}")
     if DATA_DIR.exists():
-        print("   ✅ Exists")
+        out.append("   ✅ Exists")
     else:
-        print("   ❌ Does not exist!")
-        print(f"   Creating directory...")
+        out.append("   ❌ Does not exist!")
+        out.append(f"   Creating directory...")
         DATA_DIR.mkdir(parents=True, exist_ok=True)
-        print("   ✅ Created")
+        out.append("   ✅ Created")
     
     # Check training directory
-    print(f"\n📁 Training Directory: {TRAINING_DIR}")
+    out.append(f"\n📁 Training Directory: {TRAINING_DIR}")
     if TRAINING_DIR.exists():
-        print("   ✅ Exists")
+        out.append("   ✅ Exists")
     else:
-        print("   ❌ Does not exist!")
-        print(f"   Creating directory...")
+        out.append("   ❌ Does not exist!")
+        out.append(f"   Creating directory...")
         TRAINING_DIR.mkdir(parents=True, exist_ok=True)
-        print("   ✅ Created")
+        out.append("   ✅ Created")
     
     # Check raw files
-    print("\n📄 Raw Data Files:")
+    out.append("\n📄 Raw Data Files:")
     all_exist = True
+    # One directory scan instead of an exists() + stat() call per file
+    entries = {}
+    for directory in {filepath.parent for filepath in RAW_FILES.values()}:
+        if directory.is_dir():
+            with os.scandir(directory) as it:
+                entries.update((Path(entry.path), entry) for entry in it)
     for lang, filepath in RAW_FILES.items():
-        print(f"   {lang.capitalize()}: {filepath.name}")
-        if filepath.exists():
-            size = filepath.stat().st_size / 1024  # KB
-            lines = sum(1 for _ in open(filepath, 'r', encoding='utf-8'))
-            print(f"      ✅ Exists ({size:.1f} KB, {lines} lines)")
+        out.append(f"   {lang.capitalize()}: {filepath.name}")
+        entry = entries.get(filepath)
+        if entry is not None and entry.is_file():
+            size_bytes = entry.stat().st_size
+            size = size_bytes / 1024  # KB
+            lines = count_lines(filepath) if size_bytes else 0
+            out.append(f"      ✅ Exists ({size:.1f} KB, {lines} lines)")
         else:
-            print(f"      ❌ Does not exist!")
+            out.append(f"      ❌ Does not exist!")
             all_exist = False
     
     # Check for trained models
-    print("\n🤖 Trained Models:")
+    out.append("\n🤖 Trained Models:")
     for model_type, filepath in MODEL_FILES.items():
-        print(f"   {model_type.capitalize()}: {filepath.name}")
+        out.append(f"   {model_type.capitalize()}: {filepath.name}")
         if filepath.exists():
             if model_type == "transformer":
-                print(f"      ✅ Exists (directory)")
+                out.append(f"      ✅ Exists (directory)")
             else:
                 size = filepath.stat().st_size / (1024 * 1024)  # MB
-                print(f"      ✅ Exists ({size:.1f} MB)")
+                out.append(f"      ✅ Exists ({size:.1f} MB)")
         else:
-            print(f"      ⚠️  Not trained yet")
+            out.append(f"      ⚠️  Not trained yet")
     
-    print("\n" + "="*70)
+    out.append("\n" + "="*70)
     
     if not all_exist:
-        print("❌ SETUP INCOMPLETE")
-        print("\nMissing files need to be added to:")
-        print(f"   {DATA_DIR}")
-        return False
+        out.append("❌ SETUP INCOMPLETE")
+        out.append("\nMissing files need to be added to:")
+        out.append(f"   {DATA_DIR}")
     else:
-        print("✅ SETUP COMPLETE")
-        return True
+        out.append("✅ SETUP COMPLETE")
+    
+    sys.stdout.write("\n".join(out) + "\n")
+    return all_exist
 
 # =============== HELPER FUNCTIONS ===============
 
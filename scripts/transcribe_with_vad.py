@@ -1,41 +1,96 @@
 # transcribe_with_vad.py
 import sys
 import os
+from functools import lru_cache
 from pathlib import Path
-import whisper
+from faster_whisper import decode_audio
+import ctranslate2
 import joblib
 
+sys.path.append(str(Path(__file__).resolve().parent.parent / "audio"))
+from whisper_common import FAST_DECODE_OPTIONS, QUALITY_DECODE_OPTIONS, load_whisper_model
+
+LANGID_MODEL_PATH = "training_data/langid_sklearn_model.pkl"
+
+# Silero VAD settings for faster-whisper's vad_filter
+VAD_PARAMETERS = {"min_silence_duration_ms": 500}
+
+# Segments Whisper rates as more likely silence than speech are not tagged
+NO_SPEECH_PROB_THRESHOLD = 0.6
+
+@lru_cache(maxsize=1)
+def _get_langid():
+    # Saved uncompressed by train_sklearn_turkic.py, so its numpy arrays
+    # are memory-mapped from disk instead of copied into RAM
+    return joblib.load(LANGID_MODEL_PATH, mmap_mode='r')
+
 def format_timestamp(seconds):
-    h = int(seconds // 3600)
-    m = int((seconds % 3600) // 60)
-    s = int(seconds % 60)
+    m, s = divmod(int(seconds), 60)
+    h, m = divmod(m, 60)
     return f"{h:02d}:{m:02d}:{s:02d}"
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python transcribe_with_vad.py <audio.m4a>")
+    args = sys.argv[1:]
+    quality = '--quality' in args
+    if quality:
+        args.remove('--quality')
+
+    # GPU when CTranslate2 sees one, unless overridden with --device
+    device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    if '--device' in args:
+        i = args.index('--device')
+        if i + 1 >= len(args) or args[i + 1] not in ("cpu", "cuda"):
+            print("❌ --device must be 'cpu' or 'cuda'")
+            sys.exit(1)
+        device = args[i + 1]
+        del args[i:i + 2]
+
+    if len(args) != 1:
+        print("Usage: python transcribe_with_vad.py <audio.m4a> [--quality] [--device cpu|cuda]")
         sys.exit(1)
 
-    audio_path = Path(sys.argv[1])
+    audio_path = Path(args[0])
     output_path = audio_path.with_name(audio_path.stem + "_vad.txt")
 
-    print("📦 Loading Whisper large-v3 (CPU)...")
-    model = whisper.load_model("large-v3", device="cpu")
+    # float16 on GPU; int8 weights on CPU, much faster than the PyTorch model there
+    compute_type = "float16" if device == "cuda" else "int8"
+    print(f"📦 Loading Whisper large-v3 ({device.upper()}, {compute_type})...")
+    model = load_whisper_model("large-v3", device=device, compute_type=compute_type,
+                               cpu_threads=os.cpu_count())
 
     print("🧠 Loading language ID model...")
-    langid = joblib.load("training_data/langid_sklearn_model.pkl")
+    langid = _get_langid()
 
     print("🎤 Transcribing (full audio)...")
-    result = model.transcribe(str(audio_path), verbose=False)
+    # Decode once (PyAV, in-process) to 16 kHz mono float32 and pass the array
+    audio = decode_audio(str(audio_path), sampling_rate=16000)
+    # vad_filter drops silent stretches with Silero VAD before the encoder
+    # runs; pauses of 0.5s or more count as silence (library default: 2s)
+    decode_options = QUALITY_DECODE_OPTIONS if quality else FAST_DECODE_OPTIONS
+    segments, info = model.transcribe(
+        audio,
+        vad_filter=True,
+        vad_parameters=VAD_PARAMETERS,
+        **decode_options
+    )
+    print(f"🔇 VAD removed {info.duration - info.duration_after_vad:.1f}s of silence")
+
+    starts = []
+    texts = []
+    for segment in segments:
+        if segment.no_speech_prob > NO_SPEECH_PROB_THRESHOLD:
+            continue
+        text = segment.text.strip()
+        if text:
+            starts.append(segment.start)
+            texts.append(text)
+
+    # Tag all segments with one vectorized predict call
+    langs = langid.predict(texts) if texts else []
 
     with open(output_path, "w", encoding="utf-8") as f:
-        for segment in result["segments"]:
-            text = segment["text"].strip()
-            # Skip very short or likely-silent segments
-            if len(text) < 5:  # adjust threshold as needed
-                continue
-            lang = langid.predict([text])[0]
-            ts = format_timestamp(segment["start"])
+        for start, text, lang in zip(starts, texts, langs):
+            ts = format_timestamp(start)
             f.write(f"{ts}{text}\n")
             print(f"[{ts}] ({lang}) {text[:60]}...")
 
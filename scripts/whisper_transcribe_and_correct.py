@@ -5,44 +5,98 @@ Whisper Transcription with Kazakh-to-Bashkir Orthography Correction
 This script demonstrates:
 1. Loading and transcribing an audio file with Whisper
 2. Applying orthography correction to fix Kazakh patterns
-3. Saving results in multiple formats
+3. Saving segments as JSON lines plus a comparison report
 4. Showing detailed comparison and statistics
 
+The full original/corrected texts are in the report. Each JSON line holds
+one segment, corrected and capitalized as a text on its own.
+
 USAGE:
-    python whisper_transcribe_and_correct.py <audio_file>
+    python whisper_transcribe_and_correct.py <audio_file> [model_size] [language]
+    python whisper_transcribe_and_correct.py <audio_dir> [model_size] [language] [--workers N]
     
 EXAMPLE:
     python whisper_transcribe_and_correct.py audio_clip.m4a
+    python whisper_transcribe_and_correct.py ./clips medium ba --workers 4
 """
 
+import os
 import sys
 import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
 # Import Whisper
 try:
-    import whisper
+    from faster_whisper import decode_audio
     WHISPER_AVAILABLE = True
 except ImportError:
     WHISPER_AVAILABLE = False
-    print("⚠️  Warning: whisper not installed. Install with: pip install openai-whisper")
+    print("⚠️  Warning: faster-whisper not installed. Install with: pip install faster-whisper")
+
+# orjson serializes (and UTF-8 encodes) several times faster than json
+try:
+    import orjson
+    
+    def _json_line(obj) -> bytes:
+        return orjson.dumps(obj) + b"\n"
+except ImportError:
+    def _json_line(obj) -> bytes:
+        return (json.dumps(obj, ensure_ascii=False) + "\n").encode('utf-8')
 
-# Import our corrector
+# Import our corrector and the shared Whisper settings
 sys.path.append(str(Path(__file__).parent))
+sys.path.append(str(Path(__file__).resolve().parent.parent / "audio"))
+from whisper_common import FAST_DECODE_OPTIONS, QUALITY_DECODE_OPTIONS, load_whisper_model
 from kazakh_to_bashkir_corrector import (
-    correct_orthography, 
     KazakhToBashkirCorrector,
-    analyze_differences
+    analyze_differences,
+    join_corrected,
+    sentence_case
 )
 
 
+# Segments are corrected in groups of this size with one batch_correct call
+CORRECTION_BATCH_SIZE = 32
+
+AUDIO_EXTENSIONS = {'.m4a', '.mp3', '.wav', '.flac', '.ogg', '.aac', '.mpeg'}
+
+
+def load_model(model_size: str = "base", cpu_threads: int = 0):
+    """
+    Load a faster-whisper model (int8 weights)
+    
+    The model is downloaded into WHISPER_MODEL_DIR once; later runs load it
+    from there without contacting the Hugging Face Hub.
+    
+    Args:
+        model_size: Whisper model size (tiny, base, small, medium, large-v3)
+        cpu_threads: CPU threads for the model (0 = library default)
+    
+    Returns:
+        Loaded WhisperModel
+    """
+    return load_whisper_model(model_size, device="auto", compute_type="int8",
+                              cpu_threads=cpu_threads)
+
+
+@lru_cache(maxsize=1)
+def _get_corrector():
+    # Built once per process; its rule tables are compiled in __init__
+    return KazakhToBashkirCorrector()
+
+
 def transcribe_with_correction(
     audio_path: str,
     model_size: str = "base",
     language: str = "ba",
     aggressive_correction: bool = False,
-    output_dir: str = None
+    output_dir: str = None,
+    model=None,
+    quality: bool = False
 ):
     """
     Transcribe audio with Whisper and correct orthography
@@ -53,9 +107,12 @@ def transcribe_with_correction(
         language: Language code (ba=Bashkir, kk=Kazakh, ky=Kyrgyz)
         aggressive_correction: Whether to apply aggressive corrections
         output_dir: Directory to save results (defaults to same as audio file)
+        model: Already loaded WhisperModel to reuse (loaded here if omitted)
+        quality: Use beam search decoding instead of fast greedy decoding
     
     Returns:
-        Dictionary with transcription results and corrections
+        Dictionary with metadata, statistics and the paths of the saved
+        files (the texts and segments are in those files)
     """
     audio_path = Path(audio_path)
     
@@ -80,68 +137,139 @@ def transcribe_with_correction(
     
     if not WHISPER_AVAILABLE:
         print("\n❌ Whisper is not installed. Cannot transcribe.")
-        print("   Install with: pip install openai-whisper")
+        print("   Install with: pip install faster-whisper")
         return None
     
     # Step 1: Load Whisper model
     print(f"\n{'='*80}")
     print("STEP 1: Loading Whisper Model")
     print('='*80)
-    print(f"Loading Whisper '{model_size}' model...")
-    
-    try:
-        model = whisper.load_model(model_size)
-        print("✅ Model loaded successfully!")
-    except Exception as e:
-        print(f"❌ Error loading model: {e}")
-        return None
     
-    # Step 2: Transcribe audio
+    if model is not None:
+        print("✅ Reusing loaded model")
+    else:
+        print(f"Loading Whisper '{model_size}' model...")
+        try:
+            model = load_model(model_size)
+            print("✅ Model loaded successfully!")
+        except Exception as e:
+            print(f"❌ Error loading model: {e}")
+            return None
+    
+    # Step 2: Transcribe, correct and save each segment as it is decoded
     print(f"\n{'='*80}")
-    print("STEP 2: Transcribing Audio")
+    print("STEP 2: Transcribing and Correcting Segments")
     print('='*80)
-    print("Transcribing... (this may take a moment)")
+    print("Transcribing... (segments are corrected and saved as they arrive)")
+    
+    corrector = _get_corrector()
+    base_name = audio_path.stem
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    
+    json_file = output_dir / f"{base_name}_transcription_{timestamp}.jsonl"
+    # Written under a temporary name and renamed once complete, so a failed
+    # run never leaves a truncated file that looks finished
+    partial_file = json_file.with_name(json_file.name + ".part")
+    
+    metadata = {
+        "audio_file": str(audio_path),
+        "audio_size_kb": audio_path.stat().st_size / 1024,
+        "model": model_size,
+        "language": language,
+        "timestamp": timestamp,
+        "aggressive_correction": aggressive_correction
+    }
+    
+    corrected_segments = []
+    in_context = []  # segments capitalized as part of the whole transcript
     
     try:
-        result = model.transcribe(
-            str(audio_path),
-            language=language,
-            verbose=False
-        )
+        # Decode once (PyAV, in-process) to 16 kHz mono float32 samples
+        audio = decode_audio(str(audio_path), sampling_rate=16000)
+        print(f"🎵 Decoded {len(audio) / 16000:.1f}s of audio")
         
-        original_text = result["text"].strip()
-        segments = result.get("segments", [])
+        # faster-whisper returns a generator: decoding happens as we iterate
+        decode_options = QUALITY_DECODE_OPTIONS if quality else FAST_DECODE_OPTIONS
+        segments, info = model.transcribe(audio, language=language, **decode_options)
+        
+        with open(partial_file, 'wb', buffering=1 << 20) as json_f:
+            json_f.write(_json_line({"metadata": metadata}))
+            
+            pending = []
+            seen = {}  # original segment text -> corrected text, not capitalized
+            starts_sentence = True
+            
+            def flush_pending():
+                """Correct buffered segments in one batch and write them out"""
+                nonlocal starts_sentence
+                originals = [seg.text.strip() for seg in pending]
+                
+                # Whisper often repeats lines; only correct texts not seen yet.
+                # Capitalization depends on the segment before, so it is
+                # applied in transcript order rather than cached.
+                new_texts = list(dict.fromkeys(t for t in originals if t not in seen))
+                if new_texts:
+                    fixed_new = corrector.batch_correct(new_texts, aggressive=aggressive_correction,
+                                                        capitalize=None)
+                    seen.update(zip(new_texts, fixed_new))
+                parts, starts_sentence = sentence_case([seen[t] for t in originals], starts_sentence)
+                in_context.extend(parts)
+                
+                # Each segment on its own still starts with a capital letter
+                fixed_texts = [part[:1].upper() + part[1:] for part in parts]
+                
+                for seg, original, fixed in zip(pending, originals, fixed_texts):
+                    corrected_seg = {
+                        "id": seg.id,
+                        "start": seg.start,
+                        "end": seg.end,
+                        "original_text": original,
+                        "corrected_text": fixed
+                    }
+                    corrected_segments.append(corrected_seg)
+                    
+                    # Write this segment out right away
+                    json_f.write(_json_line(corrected_seg))
+                    
+                    print(f"\n  [{seg.start:.2f}s - {seg.end:.2f}s]")
+                    if original != fixed:
+                        print(f"  Original:  {original}")
+                        print(f"  Corrected: {fixed}")
+                    else:
+                        print(f"  Text: {fixed}")
+                pending.clear()
+            
+            for seg in segments:
+                pending.append(seg)
+                if len(pending) >= CORRECTION_BATCH_SIZE:
+                    flush_pending()
+            if pending:
+                flush_pending()
+            
+            # Joining the in-context segments gives the whole transcript
+            # corrected as one text, without a second correction pass
+            original_text = ' '.join(seg["original_text"] for seg in corrected_segments)
+            corrected_text = join_corrected(in_context)
+            stats = analyze_differences(original_text, corrected_text)
+            
+            # Final JSON line carries the statistics once all segments are known
+            json_f.write(_json_line({"statistics": stats}))
         
-        print("✅ Transcription complete!")
-        print(f"\n📝 Original Transcription (length: {len(original_text)} chars):")
-        print("-" * 80)
-        print(original_text)
+        os.replace(partial_file, json_file)
         
     except Exception as e:
         print(f"❌ Error during transcription: {e}")
+        partial_file.unlink(missing_ok=True)
         return None
     
-    # Step 3: Apply orthography correction
-    print(f"\n{'='*80}")
-    print("STEP 3: Correcting Orthography")
-    print('='*80)
-    print("Applying Kazakh → Bashkir corrections...")
+    print(f"\n✅ Transcribed and corrected {len(corrected_segments)} segments")
+    print(f"✅ Saved JSON lines: {json_file}")
     
-    corrector = KazakhToBashkirCorrector()
-    corrected_text = corrector.correct_orthography(original_text, aggressive=aggressive_correction)
-    
-    print("✅ Correction complete!")
-    print(f"\n📝 Corrected Transcription (length: {len(corrected_text)} chars):")
-    print("-" * 80)
-    print(corrected_text)
-    
-    # Step 4: Analyze corrections
+    # Step 3: Analyze corrections
     print(f"\n{'='*80}")
-    print("STEP 4: Correction Analysis")
+    print("STEP 3: Correction Analysis")
     print('='*80)
     
-    stats = analyze_differences(original_text, corrected_text)
-    
     print("\n📊 Correction Statistics:")
     for key, value in stats.items():
         print(f"  {key:25}: {value}")
@@ -153,12 +281,12 @@ def transcribe_with_correction(
     # Track changes
     if stats['ұ→у'] > 0:
         corrections_made.append(f"  • ұ → у: {stats['ұ→у']} occurrences")
-    if stats['і→и'] > 0:
-        corrections_made.append(f"  • і → и: {stats['і→и']} occurrences")
-    if stats['ғ→х'] > 0:
-        corrections_made.append(f"  • ғ → х: {stats['ғ→х']} occurrences")
-    if stats['қ→к/х'] > 0:
-        corrections_made.append(f"  • қ → к/х: {stats['қ→к/х']} occurrences")
+    if stats['ү→ө'] > 0:
+        corrections_made.append(f"  • ү → ө: {stats['ү→ө']} occurrences")
+    if stats['і→е'] > 0:
+        corrections_made.append(f"  • і → е: {stats['і→е']} occurrences")
+    if stats['қ→ҡ/х'] > 0:
+        corrections_made.append(f"  • қ → ҡ/х: {stats['қ→ҡ/х']} occurrences")
     
     if corrections_made:
         for correction in corrections_made:
@@ -166,121 +294,55 @@ def transcribe_with_correction(
     else:
         print("  No orthographic corrections needed - text already in proper Bashkir!")
     
-    # Step 5: Correct segments (with timestamps)
+    # Step 4: Save summary
     print(f"\n{'='*80}")
-    print("STEP 5: Processing Segments with Timestamps")
+    print("STEP 4: Saving Summary")
     print('='*80)
     
-    corrected_segments = []
-    for seg in segments:
-        corrected_seg = {
-            "id": seg["id"],
-            "start": seg["start"],
-            "end": seg["end"],
-            "original_text": seg["text"].strip(),
-            "corrected_text": corrector.correct_orthography(seg["text"].strip(), aggressive=aggressive_correction)
-        }
-        corrected_segments.append(corrected_seg)
-    
-    print(f"✅ Processed {len(corrected_segments)} segments")
-    
-    # Show first few segments
-    print(f"\n📋 First 3 Segments (with timestamps):")
-    for seg in corrected_segments[:3]:
-        print(f"\n  [{seg['start']:.2f}s - {seg['end']:.2f}s]")
-        if seg['original_text'] != seg['corrected_text']:
-            print(f"  Original:  {seg['original_text']}")
-            print(f"  Corrected: {seg['corrected_text']}")
-        else:
-            print(f"  Text: {seg['corrected_text']}")
-    
-    if len(corrected_segments) > 3:
-        print(f"\n  ... and {len(corrected_segments) - 3} more segments")
-    
-    # Step 6: Save results
-    print(f"\n{'='*80}")
-    print("STEP 6: Saving Results")
-    print('='*80)
+    # Save comparison report
+    report_file = output_dir / f"{base_name}_comparison_report.txt"
     
-    base_name = audio_path.stem
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_parts = []
+    append = report_parts.append
+    append("=" * 80 + "\n")
+    append("WHISPER TRANSCRIPTION COMPARISON REPORT\n")
+    append("=" * 80 + "\n\n")
+    
+    append(f"Audio File: {audio_path.name}\n")
+    append(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    append(f"Model: {model_size}\n")
+    append(f"Language: {language}\n\n")
+    
+    append("-" * 80 + "\n")
+    append("ORIGINAL TRANSCRIPTION (with Kazakh orthography)\n")
+    append("-" * 80 + "\n")
+    append(original_text + "\n\n")
+    
+    append("-" * 80 + "\n")
+    append("CORRECTED TRANSCRIPTION (Bashkir orthography)\n")
+    append("-" * 80 + "\n")
+    append(corrected_text + "\n\n")
+    
+    append("-" * 80 + "\n")
+    append("CORRECTION STATISTICS\n")
+    append("-" * 80 + "\n")
+    for key, value in stats.items():
+        append(f"{key:30}: {value}\n")
     
-    # Save plain text files
-    original_file = output_dir / f"{base_name}_original.txt"
-    corrected_file = output_dir / f"{base_name}_corrected.txt"
-    
-    with open(original_file, 'w', encoding='utf-8') as f:
-        f.write(original_text)
-    print(f"✅ Saved original: {original_file}")
-    
-    with open(corrected_file, 'w', encoding='utf-8') as f:
-        f.write(corrected_text)
-    print(f"✅ Saved corrected: {corrected_file}")
-    
-    # Save JSON with full details
-    json_file = output_dir / f"{base_name}_transcription_{timestamp}.json"
-    
-    full_result = {
-        "metadata": {
-            "audio_file": str(audio_path),
-            "audio_size_kb": audio_path.stat().st_size / 1024,
-            "model": model_size,
-            "language": language,
-            "timestamp": timestamp,
-            "aggressive_correction": aggressive_correction
-        },
-        "transcription": {
-            "original_text": original_text,
-            "corrected_text": corrected_text
-        },
-        "statistics": stats,
-        "segments": corrected_segments
-    }
+    append("\n" + "-" * 80 + "\n")
+    append("SEGMENTS WITH TIMESTAMPS\n")
+    append("-" * 80 + "\n\n")
     
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(full_result, f, ensure_ascii=False, indent=2)
-    print(f"✅ Saved JSON: {json_file}")
+    for seg in corrected_segments:
+        append(f"[{seg['start']:.2f}s - {seg['end']:.2f}s]\n")
+        if seg['original_text'] != seg['corrected_text']:
+            append(f"Original:  {seg['original_text']}\n")
+            append(f"Corrected: {seg['corrected_text']}\n\n")
+        else:
+            append(f"Text: {seg['corrected_text']}\n\n")
     
-    # Save comparison report
-    report_file = output_dir / f"{base_name}_comparison_report.txt"
-    
-    with open(report_file, 'w', encoding='utf-8') as f:
-        f.write("=" * 80 + "\n")
-        f.write("WHISPER TRANSCRIPTION COMPARISON REPORT\n")
-        f.write("=" * 80 + "\n\n")
-        
-        f.write(f"Audio File: {audio_path.name}\n")
-        f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"Model: {model_size}\n")
-        f.write(f"Language: {language}\n\n")
-        
-        f.write("-" * 80 + "\n")
-        f.write("ORIGINAL TRANSCRIPTION (with Kazakh orthography)\n")
-        f.write("-" * 80 + "\n")
-        f.write(original_text + "\n\n")
-        
-        f.write("-" * 80 + "\n")
-        f.write("CORRECTED TRANSCRIPTION (Bashkir orthography)\n")
-        f.write("-" * 80 + "\n")
-        f.write(corrected_text + "\n\n")
-        
-        f.write("-" * 80 + "\n")
-        f.write("CORRECTION STATISTICS\n")
-        f.write("-" * 80 + "\n")
-        for key, value in stats.items():
-            f.write(f"{key:30}: {value}\n")
-        
-        f.write("\n" + "-" * 80 + "\n")
-        f.write("SEGMENTS WITH TIMESTAMPS\n")
-        f.write("-" * 80 + "\n\n")
-        
-        for seg in corrected_segments:
-            f.write(f"[{seg['start']:.2f}s - {seg['end']:.2f}s]\n")
-            if seg['original_text'] != seg['corrected_text']:
-                f.write(f"Original:  {seg['original_text']}\n")
-                f.write(f"Corrected: {seg['corrected_text']}\n\n")
-            else:
-                f.write(f"Text: {seg['corrected_text']}\n\n")
+    with open(report_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write(''.join(report_parts))
     
     print(f"✅ Saved report: {report_file}")
     
@@ -293,32 +355,110 @@ def transcribe_with_correction(
     print(f"📊 Total corrections: {stats['total_chars_changed']} characters changed")
     print(f"📝 Segments processed: {len(corrected_segments)}")
     
-    return full_result
+    return {
+        "metadata": metadata,
+        "statistics": stats,
+        "json_file": str(json_file),
+        "report_file": str(report_file)
+    }
 
 
-def main():
-    """Main function to run from command line"""
+_worker_model = None
+
+
+def _init_worker(model_size: str, cpu_threads: int):
+    """Process pool initializer: load the model once per worker"""
+    global _worker_model
+    _worker_model = load_model(model_size, cpu_threads=cpu_threads)
+
+
+def _transcribe_in_worker(audio_path: str, model_size: str, language: str, quality: bool):
+    return transcribe_with_correction(
+        audio_path,
+        model_size=model_size,
+        language=language,
+        model=_worker_model,
+        quality=quality
+    )
+
+
+def main_batch(files: list, model_size: str = "base", language: str = "ba", workers: int = 1,
+               quality: bool = False):
+    """
+    Transcribe and correct several audio files, loading the model once
     
-    if len(sys.argv) < 2:
-        print("Usage: python whisper_transcribe_and_correct.py <audio_file> [model_size] [language]")
-        print("\nExample:")
-        print("  python whisper_transcribe_and_correct.py audio_clip.m4a")
-        print("  python whisper_transcribe_and_correct.py audio_clip.m4a medium ba")
-        print("\nModel sizes: tiny, base, small, medium, large")
-        print("Languages: ba (Bashkir), kk (Kazakh), ky (Kyrgyz)")
-        sys.exit(1)
+    Args:
+        files: Audio file paths
+        model_size: Whisper model size
+        language: Language code
+        workers: Number of worker processes, each with its own model
+        quality: Use beam search decoding instead of fast greedy decoding
     
-    audio_file = sys.argv[1]
-    model_size = sys.argv[2] if len(sys.argv) > 2 else "base"
-    language = sys.argv[3] if len(sys.argv) > 3 else "ba"
+    Returns:
+        List of results (None for files that failed)
+    """
+    if workers <= 1:
+        model = load_model(model_size)
+        return [
+            transcribe_with_correction(f, model_size=model_size, language=language,
+                                       model=model, quality=quality)
+            for f in files
+        ]
+    
+    # Split the cores between workers so their models don't oversubscribe the CPU
+    cpu_threads = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(model_size, cpu_threads)
+    ) as pool:
+        futures = [
+            pool.submit(_transcribe_in_worker, str(f), model_size, language, quality)
+            for f in files
+        ]
+        return [future.result() for future in futures]
+
+
+def main():
+    """Main function to run from command line"""
+    parser = argparse.ArgumentParser(
+        description="Transcribe audio with Whisper and correct Kazakh→Bashkir orthography",
+        epilog="Model sizes: tiny, base, small, medium, large. "
+               "Languages: ba (Bashkir), kk (Kazakh), ky (Kyrgyz)"
+    )
+    parser.add_argument('audio', help='Audio file, or directory of audio files')
+    parser.add_argument('model_size', nargs='?', default='base', help='Whisper model size (default: base)')
+    parser.add_argument('language', nargs='?', default='ba', help='Language code (default: ba)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for a directory (default: 1)')
+    parser.add_argument('--quality', action='store_true',
+                        help='Beam search decoding (slower, more accurate)')
+    args = parser.parse_args()
+    
+    audio_path = Path(args.audio)
     
     try:
-        result = transcribe_with_correction(
-            audio_file,
-            model_size=model_size,
-            language=language,
-            aggressive_correction=False
-        )
+        if audio_path.is_dir():
+            files = sorted(f for f in audio_path.iterdir()
+                           if f.suffix.lower() in AUDIO_EXTENSIONS)
+            if not files:
+                print(f"❌ No audio files found in: {audio_path}")
+                sys.exit(1)
+            print(f"📬 Found {len(files)} audio file(s) in: {audio_path}")
+            results = main_batch(files, args.model_size, args.language,
+                                 workers=args.workers, quality=args.quality)
+            failed = [f.name for f, r in zip(files, results) if not r]
+            result = not failed
+            if failed:
+                print(f"\n❌ Failed: {', '.join(failed)}")
+        else:
+            result = transcribe_with_correction(
+                audio_path,
+                model_size=args.model_size,
+                language=args.language,
+                aggressive_correction=False,
+                quality=args.quality
+            )
         
         if result:
             print("\n" + "="*80)
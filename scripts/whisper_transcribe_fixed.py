@@ -2,8 +2,12 @@
 """
 Fixed Whisper Transcription with Auto-Language Detection
 
+Transcribes with faster-whisper's BatchedInferencePipeline: Silero VAD cuts
+the audio into speech chunks that are decoded in batches (the same batched
+backend WhisperX builds on).
+
 USAGE:
-    python whisper_transcribe_fixed.py <audio_file> [model_size] [language]
+    python whisper_transcribe_fixed.py <audio_file> [model_size] [language] [--compute-type TYPE] [--quiet]
     
 EXAMPLES:
     # Auto-detect language (RECOMMENDED)
@@ -16,34 +20,148 @@ EXAMPLES:
     python whisper_transcribe_fixed.py ../audio/big_clip_file.m4a base kk
 """
 
+import gc
+import os
 import sys
 import json
+import importlib.util
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
-# Import Whisper
+# Check for Whisper without importing it; the import itself (CTranslate2,
+# PyAV, onnxruntime) is deferred until a model is actually needed
+WHISPER_AVAILABLE = importlib.util.find_spec("faster_whisper") is not None
+if not WHISPER_AVAILABLE:
+    print("⚠️  Warning: faster-whisper not installed. Install with: pip install faster-whisper")
+
+
+@lru_cache(maxsize=1)
+def _get_faster_whisper():
+    import faster_whisper
+    return faster_whisper
+
+
+# orjson emits UTF-8 directly and is much faster than json for the full dump
 try:
-    import whisper
-    WHISPER_AVAILABLE = True
+    import orjson
+    
+    def _json_bytes(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
 except ImportError:
-    WHISPER_AVAILABLE = False
-    print("⚠️  Warning: whisper not installed. Install with: pip install openai-whisper")
+    def _json_bytes(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
 
-# Import our corrector
+# Import our corrector and the shared model loader
 sys.path.append(str(Path(__file__).parent))
+sys.path.append(str(Path(__file__).resolve().parent.parent / "audio"))
+from whisper_common import load_whisper_model
 from kazakh_to_bashkir_corrector import (
     correct_orthography, 
+    batch_correct,
+    join_corrected,
     KazakhToBashkirCorrector,
     analyze_differences
 )
 
 
+# VAD-split chunks decoded together in one batched forward pass
+BATCH_SIZE = 16
+
+# Speech regions are merged into chunks of at most this many seconds.
+# Chunks are cut in silence, so no overlap/stitching between them is needed.
+CHUNK_LENGTH = 30
+
+# Model replicas CTranslate2 keeps per loaded model. With N > 1, up to N
+# threads calling transcribe_with_correction decode in parallel.
+WHISPER_INSTANCES = max(1, int(os.getenv("WHISPER_INSTANCES", "1")))
+
+# Loaded pipelines keyed by (model_size, device, compute_type); the lock
+# keeps concurrent first calls from each loading their own copy
+_MODEL_CACHE = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def load_model(model_size: str = "base", compute_type: str = None):
+    """
+    Load a faster-whisper model wrapped in a batched inference pipeline
+    
+    Models are cached, so repeated calls with the same size reuse the
+    already loaded weights, and are downloaded into WHISPER_MODEL_DIR only
+    once. The returned pipeline may be shared between threads; set
+    WHISPER_INSTANCES to let that many of them run at once.
+    
+    Args:
+        model_size: Whisper model size (tiny, base, small, medium, large-v3)
+        compute_type: CTranslate2 compute type (int8, int8_float16, float16,
+            float32); None picks int8_float16 on GPU and int8 on CPU
+    
+    Returns:
+        BatchedInferencePipeline around the loaded WhisperModel
+    """
+    import ctranslate2
+    faster_whisper = _get_faster_whisper()
+    
+    if ctranslate2.get_cuda_device_count() > 0:
+        device = "cuda"
+        compute_type = compute_type or "int8_float16"
+    else:
+        device = "cpu"
+        compute_type = compute_type or "int8"
+    
+    key = (model_size, device, compute_type)
+    with _MODEL_CACHE_LOCK:
+        pipeline = _MODEL_CACHE.get(key)
+        if pipeline is None:
+            # CTranslate2 kernels are already fused; on CPU, spread every core
+            # over the replicas rather than using CTranslate2's default of 4 threads
+            if device == "cpu":
+                cpu_threads = max(1, (os.cpu_count() or 1) // WHISPER_INSTANCES)
+            else:
+                cpu_threads = 0
+            model = load_whisper_model(model_size, device=device, compute_type=compute_type,
+                                       cpu_threads=cpu_threads,
+                                       num_workers=WHISPER_INSTANCES)
+            pipeline = faster_whisper.BatchedInferencePipeline(model=model)
+            _MODEL_CACHE[key] = pipeline
+    return pipeline
+
+
+def unload_models():
+    """Drop all cached models and release their CPU/GPU memory"""
+    with _MODEL_CACHE_LOCK:
+        _MODEL_CACHE.clear()
+    gc.collect()
+
+
+def _quiet(*args, **kwargs):
+    pass
+
+
+def _write_text(path: Path, text: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def _write_json(path: Path, data: dict):
+    # Unbuffered: the serialized bytes go straight to the OS, no extra copy.
+    # Raw writes may be partial, so advance a memoryview until all is written.
+    view = memoryview(_json_bytes(data))
+    with open(path, 'wb', buffering=0) as f:
+        while view:
+            view = view[f.write(view):]
+
+
 def transcribe_with_correction(
     audio_path: str,
     model_size: str = "base",
     language: str = None,  # Changed default to None for auto-detect
     aggressive_correction: bool = False,
-    output_dir: str = None
+    output_dir: str = None,
+    compute_type: str = None,
+    verbose: bool = True
 ):
     """
     Transcribe audio with Whisper and correct orthography
@@ -54,10 +172,13 @@ def transcribe_with_correction(
         language: Language code (None=auto, ru=Russian, kk=Kazakh, ky=Kyrgyz)
         aggressive_correction: Whether to apply aggressive corrections
         output_dir: Directory to save results (defaults to same as audio file)
+        compute_type: Model weight/compute precision (None = int8_float16 on GPU, int8 on CPU)
+        verbose: Print progress, previews and statistics (errors are always printed)
     
     Returns:
         Dictionary with transcription results and corrections
     """
+    say = print if verbose else _quiet
     audio_path = Path(audio_path)
     
     if not audio_path.exists():
@@ -70,177 +191,191 @@ def transcribe_with_correction(
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
     
-    print("=" * 80)
-    print("WHISPER TRANSCRIPTION WITH ORTHOGRAPHY CORRECTION (FIXED)")
-    print("=" * 80)
-    print(f"\n📁 Audio File: {audio_path.name}")
-    print(f"📊 File Size: {audio_path.stat().st_size / 1024:.1f} KB")
-    print(f"🤖 Model: {model_size}")
+    say("=" * 80)
+    say("WHISPER TRANSCRIPTION WITH ORTHOGRAPHY CORRECTION (FIXED)")
+    say("=" * 80)
+    say(f"\n📁 Audio File: {audio_path.name}")
+    say(f"📊 File Size: {audio_path.stat().st_size / 1024:.1f} KB")
+    say(f"🤖 Model: {model_size}")
+    say(f"🔢 Compute Type: {compute_type or 'auto'}")
     
     # Language handling
     language_names = {'ru': 'Russian', 'kk': 'Kazakh', 'ky': 'Kyrgyz'}
     
     if language is None:
-        print(f"🗣️  Language: AUTO-DETECT (recommended for Bashkir)")
+        say(f"🗣️  Language: AUTO-DETECT (recommended for Bashkir)")
     elif language in language_names:
-        print(f"🗣️  Language: {language} ({language_names[language]})")
+        say(f"🗣️  Language: {language} ({language_names[language]})")
     else:
-        print(f"⚠️  WARNING: Language '{language}' may not be supported by Whisper!")
-        print(f"   Consider using: None (auto), 'ru' (Russian), or 'kk' (Kazakh)")
+        say(f"⚠️  WARNING: Language '{language}' may not be supported by Whisper!")
+        say(f"   Consider using: None (auto), 'ru' (Russian), or 'kk' (Kazakh)")
     
-    print(f"⚙️  Aggressive Correction: {aggressive_correction}")
+    say(f"⚙️  Aggressive Correction: {aggressive_correction}")
     
     if not WHISPER_AVAILABLE:
         print("\n❌ Whisper is not installed. Cannot transcribe.")
-        print("   Install with: pip install openai-whisper")
+        print("   Install with: pip install faster-whisper")
         return None
     
     # Step 1: Load Whisper model
-    print(f"\n{'='*80}")
-    print("STEP 1: Loading Whisper Model")
-    print('='*80)
-    print(f"Loading Whisper '{model_size}' model...")
+    say(f"\n{'='*80}")
+    say("STEP 1: Loading Whisper Model")
+    say('='*80)
+    say(f"Loading Whisper '{model_size}' model...")
     
     try:
-        model = whisper.load_model(model_size)
-        print("✅ Model loaded successfully!")
+        model = load_model(model_size, compute_type=compute_type)
+        say("✅ Model loaded successfully!")
     except Exception as e:
         print(f"❌ Error loading model: {e}")
         return None
     
     # Step 2: Transcribe audio
-    print(f"\n{'='*80}")
-    print("STEP 2: Transcribing Audio")
-    print('='*80)
-    print("Transcribing... (this may take a moment)")
+    say(f"\n{'='*80}")
+    say("STEP 2: Transcribing Audio")
+    say('='*80)
+    say("Transcribing... (this may take a moment)")
     
     try:
-        # Transcribe with language parameter
+        # VAD splits the audio into speech chunks that are decoded in batches
         if language is None:
-            print("🔍 Auto-detecting language...")
-            result = model.transcribe(str(audio_path))
-            detected_lang = result.get('language', 'unknown')
-            print(f"✅ Detected language: {detected_lang}")
-        else:
-            result = model.transcribe(str(audio_path), language=language)
+            say("🔍 Auto-detecting language...")
+        # Decode and resample once, in-process (PyAV), to 16 kHz mono float32
+        audio = _get_faster_whisper().decode_audio(str(audio_path), sampling_rate=16000)
+        seg_iter, info = model.transcribe(
+            audio,
+            batch_size=BATCH_SIZE,
+            chunk_length=CHUNK_LENGTH,
+            language=language,
+            vad_filter=True
+        )
+        detected_lang = info.language
+        say(f"🔇 VAD kept {info.duration_after_vad:.1f}s of speech "
+              f"out of {info.duration:.1f}s")
+        if language is None:
+            say(f"✅ Detected language: {detected_lang}")
+        
+        # Segments are a generator; decoding runs while we collect them.
+        # Kept as parallel columns; per-segment dicts are only built for the JSON.
+        starts, ends, texts = [], [], []
+        for seg in seg_iter:
+            starts.append(seg.start)
+            ends.append(seg.end)
+            texts.append(seg.text)
         
-        print("✅ Transcription complete!")
+        say("✅ Transcription complete!")
         
-        # Get text and segments
-        original_text = result["text"].strip()
-        segments = result.get("segments", [])
+        original_text = "".join(texts).strip()
         
-        print(f"\n📝 Original Transcription (length: {len(original_text)} chars):")
-        print("-" * 80)
-        print(original_text[:500])  # Show first 500 chars
-        if len(original_text) > 500:
-            print(f"\n... (showing first 500 of {len(original_text)} characters)")
+        if verbose:
+            say(f"\n📝 Original Transcription (length: {len(original_text)} chars):")
+            say("-" * 80)
+            say(original_text[:500])  # Show first 500 chars
+            if len(original_text) > 500:
+                say(f"\n... (showing first 500 of {len(original_text)} characters)")
         
         # Check if transcription looks valid
         if len(original_text) < 10:
-            print("\n⚠️  WARNING: Very short transcription! Audio might be:")
-            print("   - Silent or very quiet")
-            print("   - Corrupted")
-            print("   - Not in a supported language")
+            say("\n⚠️  WARNING: Very short transcription! Audio might be:")
+            say("   - Silent or very quiet")
+            say("   - Corrupted")
+            say("   - Not in a supported language")
         
         # Check for hallucination indicators
         if any(char in original_text for char in ['魔', '�', '\ufffd']):
-            print("\n⚠️  WARNING: Non-standard characters detected!")
-            print("   This might indicate hallucination or encoding issues.")
-            print("   Try:")
-            print("   1. Use language=None for auto-detect")
-            print("   2. Use language='ru' (Russian)")
-            print("   3. Check audio file quality")
+            say("\n⚠️  WARNING: Non-standard characters detected!")
+            say("   This might indicate hallucination or encoding issues.")
+            say("   Try:")
+            say("   1. Use language=None for auto-detect")
+            say("   2. Use language='ru' (Russian)")
+            say("   3. Check audio file quality")
         
     except Exception as e:
         print(f"❌ Error during transcription: {e}")
         return None
     
     # Step 3: Correct orthography
-    print(f"\n{'='*80}")
-    print("STEP 3: Correcting Orthography")
-    print('='*80)
-    print("Applying Kazakh → Bashkir corrections...")
-    
-    corrected_text = correct_orthography(original_text, aggressive=aggressive_correction)
+    say(f"\n{'='*80}")
+    say("STEP 3: Correcting Orthography")
+    say('='*80)
+    say("Applying Kazakh → Bashkir corrections...")
+    
+    # Segments are corrected once, in a single batch_correct call. Without
+    # per-segment capitalization the parts keep the sentence context of the
+    # whole transcript, so joining them gives the full corrected text and a
+    # segment that continues a sentence is not capitalized there.
+    originals = [text.strip() for text in texts]
+    in_context = batch_correct(originals, aggressive=aggressive_correction, capitalize=False)
+    n_segments = len(originals)
+    
+    # Each segment on its own still starts with a capital letter
+    fixed_texts = [part[:1].upper() + part[1:] for part in in_context]
+    
+    if n_segments:
+        corrected_text = join_corrected(in_context)
+    else:
+        corrected_text = correct_orthography(original_text, aggressive=aggressive_correction)
     
-    print("✅ Correction complete!")
-    print(f"\n📝 Corrected Transcription (length: {len(corrected_text)} chars):")
-    print("-" * 80)
-    print(corrected_text[:500])
-    if len(corrected_text) > 500:
-        print(f"\n... (showing first 500 of {len(corrected_text)} characters)")
+    say("✅ Correction complete!")
+    if verbose:
+        say(f"\n📝 Corrected Transcription (length: {len(corrected_text)} chars):")
+        say("-" * 80)
+        say(corrected_text[:500])
+        if len(corrected_text) > 500:
+            say(f"\n... (showing first 500 of {len(corrected_text)} characters)")
     
     # Step 4: Analysis
-    print(f"\n{'='*80}")
-    print("STEP 4: Correction Analysis")
-    print('='*80)
+    say(f"\n{'='*80}")
+    say("STEP 4: Correction Analysis")
+    say('='*80)
     
     stats = analyze_differences(original_text, corrected_text)
     
-    print(f"\n📊 Correction Statistics:")
+    say(f"\n📊 Correction Statistics:")
     for key, value in stats.items():
-        print(f"  {key:<25}: {value}")
+        say(f"  {key:<25}: {value}")
     
     if stats['total_chars_changed'] == 0:
-        print("\n🔍 Specific Changes Made:")
-        print("  No orthographic corrections needed - text already in proper Bashkir!")
+        say("\n🔍 Specific Changes Made:")
+        say("  No orthographic corrections needed - text already in proper Bashkir!")
     
     # Step 5: Process segments
-    print(f"\n{'='*80}")
-    print("STEP 5: Processing Segments with Timestamps")
-    print('='*80)
-    
-    corrected_segments = []
-    for seg in segments:
-        corrected_seg = {
-            "start": seg["start"],
-            "end": seg["end"],
-            "original_text": seg["text"].strip(),
-            "corrected_text": correct_orthography(seg["text"].strip(), aggressive=aggressive_correction)
-        }
-        corrected_segments.append(corrected_seg)
-    
-    print(f"✅ Processed {len(segments)} segments")
+    say(f"\n{'='*80}")
+    say("STEP 5: Processing Segments with Timestamps")
+    say('='*80)
+    
+    say(f"✅ Processed {n_segments} segments")
     
     # Show first few segments
-    if segments:
-        print(f"\n📋 First 3 Segments (with timestamps):\n")
-        for i, seg in enumerate(corrected_segments[:3]):
-            print(f"  [{seg['start']:.2f}s - {seg['end']:.2f}s]")
-            print(f"  Text: {seg['corrected_text']}\n")
+    if verbose and n_segments:
+        say(f"\n📋 First 3 Segments (with timestamps):\n")
+        for start, end, fixed in zip(starts[:3], ends[:3], fixed_texts[:3]):
+            say(f"  [{start:.2f}s - {end:.2f}s]")
+            say(f"  Text: {fixed}\n")
         
-        if len(segments) > 3:
-            print(f"  ... and {len(segments) - 3} more segments")
+        if n_segments > 3:
+            say(f"  ... and {n_segments - 3} more segments")
     
     # Step 6: Save results
-    print(f"\n{'='*80}")
-    print("STEP 6: Saving Results")
-    print('='*80)
+    say(f"\n{'='*80}")
+    say("STEP 6: Saving Results")
+    say('='*80)
     
     base_name = audio_path.stem
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
-    # Save original transcription
     original_file = output_dir / f"{base_name}_original.txt"
-    with open(original_file, 'w', encoding='utf-8') as f:
-        f.write(original_text)
-    print(f"✅ Saved original: {original_file}")
-    
-    # Save corrected transcription
     corrected_file = output_dir / f"{base_name}_corrected.txt"
-    with open(corrected_file, 'w', encoding='utf-8') as f:
-        f.write(corrected_text)
-    print(f"✅ Saved corrected: {corrected_file}")
-    
-    # Save JSON with full data
     json_file = output_dir / f"{base_name}_transcription_{timestamp}.json"
+    report_file = output_dir / f"{base_name}_comparison_report.txt"
+    
+    # JSON with full data
     json_data = {
         "metadata": {
             "audio_file": audio_path.name,
             "transcription_date": timestamp,
             "model": model_size,
-            "language": language if language else "auto-detected: " + result.get('language', 'unknown'),
+            "language": language if language else "auto-detected: " + detected_lang,
             "aggressive_correction": aggressive_correction
         },
         "transcription": {
@@ -248,72 +383,102 @@ def transcribe_with_correction(
             "corrected_text": corrected_text
         },
         "statistics": stats,
-        "segments": corrected_segments
+        "segments": [
+            {
+                "start": start,
+                "end": end,
+                "original_text": original,
+                "corrected_text": fixed
+            }
+            for start, end, original, fixed in zip(starts, ends, originals, fixed_texts)
+        ]
     }
     
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(json_data, f, ensure_ascii=False, indent=2)
-    print(f"✅ Saved JSON: {json_file}")
-    
-    # Save comparison report
-    report_file = output_dir / f"{base_name}_comparison_report.txt"
-    with open(report_file, 'w', encoding='utf-8') as f:
-        f.write("=" * 80 + "\n")
-        f.write("WHISPER TRANSCRIPTION COMPARISON REPORT\n")
-        f.write("=" * 80 + "\n\n")
-        f.write(f"Audio File: {audio_path.name}\n")
-        f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"Model: {model_size}\n")
-        f.write(f"Language: {language if language else 'auto-detected: ' + result.get('language', 'unknown')}\n\n")
-        
-        f.write("-" * 80 + "\n")
-        f.write("ORIGINAL TRANSCRIPTION (with Kazakh orthography)\n")
-        f.write("-" * 80 + "\n")
-        f.write(original_text + "\n\n")
-        
-        f.write("-" * 80 + "\n")
-        f.write("CORRECTED TRANSCRIPTION (Bashkir orthography)\n")
-        f.write("-" * 80 + "\n")
-        f.write(corrected_text + "\n\n")
-        
-        f.write("-" * 80 + "\n")
-        f.write("CORRECTION STATISTICS\n")
-        f.write("-" * 80 + "\n")
-        for key, value in stats.items():
-            f.write(f"{key:<30}: {value}\n")
-    
-    print(f"✅ Saved report: {report_file}")
+    # Comparison report, assembled in memory and written in one go
+    report_parts = []
+    append = report_parts.append
+    append("=" * 80 + "\n")
+    append("WHISPER TRANSCRIPTION COMPARISON REPORT\n")
+    append("=" * 80 + "\n\n")
+    append(f"Audio File: {audio_path.name}\n")
+    append(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    append(f"Model: {model_size}\n")
+    append(f"Language: {language if language else 'auto-detected: ' + detected_lang}\n\n")
+    
+    append("-" * 80 + "\n")
+    append("ORIGINAL TRANSCRIPTION (with Kazakh orthography)\n")
+    append("-" * 80 + "\n")
+    append(original_text + "\n\n")
+    
+    append("-" * 80 + "\n")
+    append("CORRECTED TRANSCRIPTION (Bashkir orthography)\n")
+    append("-" * 80 + "\n")
+    append(corrected_text + "\n\n")
+    
+    append("-" * 80 + "\n")
+    append("CORRECTION STATISTICS\n")
+    append("-" * 80 + "\n")
+    report_parts.extend(f"{key:<30}: {value}\n" for key, value in stats.items())
+    report_text = ''.join(report_parts)
+    
+    # The four files are independent, so write them concurrently
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        saves = [
+            ("original", original_file, executor.submit(_write_text, original_file, original_text)),
+            ("corrected", corrected_file, executor.submit(_write_text, corrected_file, corrected_text)),
+            ("JSON", json_file, executor.submit(_write_json, json_file, json_data)),
+            ("report", report_file, executor.submit(_write_text, report_file, report_text)),
+        ]
+    for label, path, future in saves:
+        future.result()  # re-raises any write error
+        say(f"✅ Saved {label}: {path}")
     
     # Summary
-    print(f"\n{'='*80}")
-    print("SUMMARY")
-    print('='*80)
-    print(f"\n✅ Transcription complete!")
-    print(f"📁 Files saved to: {output_dir}")
-    print(f"📊 Total corrections: {stats['total_chars_changed']} characters changed")
-    print(f"📝 Segments processed: {len(segments)}")
-    
-    print(f"\n{'='*80}")
-    print("✓ SUCCESS! All files saved.")
-    print('='*80)
+    say(f"\n{'='*80}")
+    say("SUMMARY")
+    say('='*80)
+    say(f"\n✅ Transcription complete!")
+    say(f"📁 Files saved to: {output_dir}")
+    say(f"📊 Total corrections: {stats['total_chars_changed']} characters changed")
+    say(f"📝 Segments processed: {n_segments}")
+    
+    say(f"\n{'='*80}")
+    say("✓ SUCCESS! All files saved.")
+    say('='*80)
     
     return json_data
 
 
 if __name__ == "__main__":
     # Parse command line arguments
-    if len(sys.argv) < 2:
-        print("Usage: python whisper_transcribe_fixed.py <audio_file> [model_size] [language]")
+    args = sys.argv[1:]
+    verbose = True
+    if '--quiet' in args:
+        args.remove('--quiet')
+        verbose = False
+    
+    compute_type = None
+    if '--compute-type' in args:
+        i = args.index('--compute-type')
+        if i + 1 >= len(args):
+            print("❌ --compute-type needs a value (int8, int8_float16, float16, float32)")
+            sys.exit(1)
+        compute_type = args[i + 1]
+        del args[i:i + 2]
+    
+    if len(args) < 1:
+        print("Usage: python whisper_transcribe_fixed.py <audio_file> [model_size] [language] [--compute-type TYPE] [--quiet]")
         print("\nExamples:")
         print("  python whisper_transcribe_fixed.py audio.m4a")
         print("  python whisper_transcribe_fixed.py audio.m4a base ru")
         print("  python whisper_transcribe_fixed.py audio.m4a medium kk")
+        print("  python whisper_transcribe_fixed.py audio.m4a medium kk --compute-type float16")
         print("\nSupported languages: None (auto), ru (Russian), kk (Kazakh), ky (Kyrgyz)")
         sys.exit(1)
     
-    audio_file = sys.argv[1]
-    model_size = sys.argv[2] if len(sys.argv) > 2 else "base"
-    language = sys.argv[3] if len(sys.argv) > 3 else None
+    audio_file = args[0]
+    model_size = args[1] if len(args) > 1 else "base"
+    language = args[2] if len(args) > 2 else None
     
     # Convert "None" string to actual None
     if language and language.lower() in ['none', 'auto', 'null']:
@@ -323,7 +488,9 @@ if __name__ == "__main__":
         result = transcribe_with_correction(
             audio_path=audio_file,
             model_size=model_size,
-            language=language
+            language=language,
+            compute_type=compute_type,
+            verbose=verbose
         )
         
         if result is None: